@@ -0,0 +1,388 @@
+"""
+Owner dashboard analytics
+Dashboard figures are read from materialized counters maintained with $inc on
+every write. compute_analytics() is the from-source path used before the
+counters exist: index-backed counts and a server-side $group, issued
+concurrently so the average rating covers every row in the window.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+RECENT_WINDOW = timedelta(days=30)
+
+
+def recent_query(since: datetime) -> Dict[str, Any]:
+    return {"timestamp": {"$gte": since}}
+
+
+def recent_rating_pipeline(since: datetime) -> List[Dict[str, Any]]:
+    return [
+        {"$match": recent_query(since)},
+        {"$group": {"_id": None, "count": {"$sum": 1}, "avg_rating": {"$avg": "$rating"}}}
+    ]
+
+
+async def recent_rating_stats(feedback, since: datetime) -> Dict[str, Any]:
+    """Count and mean rating of feedback since a moment, computed in MongoDB"""
+    rows = await feedback.aggregate(recent_rating_pipeline(since)).to_list(1)
+    if not rows:
+        return {"count": 0, "avg_rating": 0}
+    return {"count": rows[0]["count"], "avg_rating": rows[0]["avg_rating"] or 0}
+
+
+async def compute_analytics(db, now: Optional[datetime] = None) -> Dict[str, Any]:
+    since = (now or datetime.utcnow()) - RECENT_WINDOW
+    subscribers, feedback, contacts, recent_feedback, contacts_30d = await asyncio.gather(
+        db.subscribers.count_documents({}),
+        db.feedback.count_documents({}),
+        db.contacts.count_documents({}),
+        recent_rating_stats(db.feedback, since),
+        # Range counts walk the (timestamp, id) listing indexes
+        db.contacts.count_documents(recent_query(since))
+    )
+    return {
+        "subscribers": subscribers,
+        "feedback": feedback,
+        "contacts": contacts,
+        "avg_rating": round(recent_feedback["avg_rating"], 1),
+        "recent_activity": {
+            "feedback_30d": recent_feedback["count"],
+            "contacts_30d": contacts_30d
+        }
+    }
+
+
+COUNTER_FIELDS = ("subscribers", "feedback", "contacts", "rating_sum", "rating_count")
+# Source collection -> timestamp field each write is bucketed by
+COUNTED_COLLECTIONS = {"subscribers": "subscribed_at", "feedback": "timestamp", "contacts": "timestamp"}
+DAY_ORDER = [("date", 1)]
+
+
+def reconcile_pipeline(
+    kind: str,
+    since: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    match: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Per-day counts (and rating sums for feedback) of one counted collection
+
+    before excludes rows stamped at or after it but keeps rows without a
+    timestamp; match narrows the rows further, e.g. to a bulk delete filter.
+    """
+    time_field = COUNTED_COLLECTIONS[kind]
+    group: Dict[str, Any] = {
+        "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": f"${time_field}"}},
+        "count": {"$sum": 1}
+    }
+    if kind == "feedback":
+        group.update(rating_sum={"$sum": "$rating"}, rating_count={"$sum": 1})
+    bounds: Dict[str, Any] = {}
+    if since:
+        bounds["$gte"] = since
+    if before:
+        bounds["$not"] = {"$gte": before}
+    conditions = [condition for condition in (match, {time_field: bounds} if bounds else None) if condition]
+    pipeline = [{"$group": group}]
+    if conditions:
+        pipeline.insert(0, {"$match": conditions[0] if len(conditions) == 1 else {"$and": conditions}})
+    return pipeline
+
+
+def day_buckets_query(start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"kind": "day"}
+    bounds = {op: value for op, value in (("$gte", start), ("$lt", end)) if value is not None}
+    if bounds:
+        query["date"] = bounds
+    return query
+
+
+def day_key(moment: datetime) -> str:
+    return f"day:{moment:%Y-%m-%d}"
+
+
+def day_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+TIMESERIES_METRICS = ("subscribers", "feedback", "contacts", "rating_count", "avg_rating")
+TIMESERIES_GRANULARITIES = ("day", "week", "month")
+
+
+def period_start(day: datetime, granularity: str) -> datetime:
+    if granularity == "week":
+        # ISO weeks start on Monday
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+class AnalyticsCounters:
+    """Materialized dashboard counters kept current with $inc
+
+    One "totals" document plus one "day:YYYY-MM-DD" document per UTC day hold
+    counts per collection and the rating sum/count. Writes bump both with a
+    single bulk_write; reconcile() recomputes everything from the source
+    collections to repair drift from failed increments.
+
+    Only one reconcile runs at a time. Its $set would overwrite increments
+    landing mid-rebuild, so tracked writes are held back while it runs and
+    those newer than its cutoff are replayed once it has written.
+    """
+
+    def __init__(self, collection, db):
+        self.collection = collection
+        self.db = db
+        self._tasks = set()
+        self._recording = set()
+        self._reconcile_lock = asyncio.Lock()
+        self._queued_reconcile = None
+        # Increments tracked while a reconcile rebuilds the counters
+        self._deferred = None
+
+    async def record(
+        self, kind: str, moment: datetime, count: int = 1, rating: Optional[int] = None, day: bool = True
+    ) -> None:
+        inc: Dict[str, Any] = {kind: count}
+        if rating is not None:
+            inc.update(rating_sum=rating, rating_count=1)
+        operations = [UpdateOne({"_id": "totals"}, {"$inc": inc}, upsert=True)]
+        if day:
+            operations.append(UpdateOne(
+                {"_id": day_key(moment)},
+                {"$inc": inc, "$setOnInsert": {"kind": "day", "date": day_start(moment)}},
+                upsert=True
+            ))
+        await self.collection.bulk_write(operations, ordered=False)
+
+    def track(self, kind: str, moment: datetime, count: int = 1, rating: Optional[int] = None) -> None:
+        """Record in the background; a failed increment is logged and left to reconcile()"""
+        if self._deferred is not None:
+            self._deferred.append((kind, moment, count, rating))
+            return
+        self._track_now(kind, moment, count, rating)
+
+    def _track_now(self, kind, moment, count, rating, day: bool = True) -> None:
+        task = self._spawn(self._record_logged(kind, moment, count, rating, day))
+        self._recording.add(task)
+        task.add_done_callback(self._recording.discard)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        # Hold a reference until done so the task is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _record_logged(self, kind, moment, count, rating, day=True) -> None:
+        try:
+            await self.record(kind, moment, count, rating, day)
+        except Exception as e:
+            logger.error(f"Failed to update analytics counters for {kind}: {e}")
+
+    @property
+    def reconciling(self) -> bool:
+        """Whether a reconcile is running or queued"""
+        return self._queued_reconcile is not None or self._reconcile_lock.locked()
+
+    def reconcile_soon(self) -> None:
+        """Queue a background rebuild unless one is already waiting to start
+
+        A reconcile already running may have read the source before the change
+        that prompted this call, so one more is queued behind it.
+        """
+        if self._queued_reconcile is not None:
+            return
+
+        async def run():
+            try:
+                async with self._reconcile_lock:
+                    self._queued_reconcile = None
+                    await self._rebuild()
+            except Exception as e:
+                logger.error(f"Analytics reconciliation failed: {e}")
+            finally:
+                if self._queued_reconcile is task:
+                    self._queued_reconcile = None
+        task = self._queued_reconcile = self._spawn(run())
+
+    async def delete_many(self, kind: str, query: Dict[str, Any]) -> int:
+        """Delete rows of a counted collection and decrement their buckets
+
+        The rows are counted per day first; if the delete removed a different
+        number (rows changed in between), the counters are rebuilt instead.
+        Holding the reconcile lock keeps a rebuild from reading half of it.
+        """
+        async with self._reconcile_lock:
+            rows = await self.db[kind].aggregate(reconcile_pipeline(kind, match=query)).to_list(None)
+            result = await self.db[kind].delete_many(query)
+            if result.deleted_count and result.deleted_count == sum(row["count"] for row in rows):
+                await self._decrement(kind, rows)
+            elif result.deleted_count:
+                self.reconcile_soon()
+        return result.deleted_count
+
+    async def _decrement(self, kind: str, rows: List[Dict[str, Any]]) -> None:
+        totals: Dict[str, int] = {}
+        operations = []
+        for row in rows:
+            dec = {kind: -row["count"]}
+            if kind == "feedback":
+                dec.update(rating_sum=-row["rating_sum"], rating_count=-row["rating_count"])
+            for field, value in dec.items():
+                totals[field] = totals.get(field, 0) + value
+            if row["_id"] is not None:
+                # Rows without a timestamp count towards totals only
+                operations.append(UpdateOne({"_id": f"day:{row['_id']}"}, {"$inc": dec}))
+        operations.append(UpdateOne({"_id": "totals"}, {"$inc": totals}))
+        for start in range(0, len(operations), 1000):
+            await self.collection.bulk_write(operations[start:start + 1000], ordered=False)
+
+    async def read(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Dashboard figures from one indexed _id lookup; None until first reconcile
+
+        record() may create the totals document first, holding only the events
+        since startup, so it counts only once a full reconcile has stamped it.
+        """
+        today = day_start(now or datetime.utcnow())
+        days = [day_key(today - timedelta(days=i)) for i in range(RECENT_WINDOW.days)]
+        docs = {doc["_id"]: doc for doc in await self.collection.find(
+            {"_id": {"$in": ["totals", *days]}}
+        ).to_list(len(days) + 1)}
+        totals = docs.get("totals")
+        if totals is None or "reconciled_at" not in totals:
+            return None
+        recent = {field: sum(docs[d].get(field, 0) for d in days if d in docs) for field in COUNTER_FIELDS}
+        return {
+            "subscribers": totals.get("subscribers", 0),
+            "feedback": totals.get("feedback", 0),
+            "contacts": totals.get("contacts", 0),
+            "avg_rating": round(recent["rating_sum"] / recent["rating_count"], 1) if recent["rating_count"] else 0,
+            "recent_activity": {
+                "feedback_30d": recent["feedback"],
+                "contacts_30d": recent["contacts"]
+            }
+        }
+
+    async def reconcile(self, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Recompute day buckets from the source collections
+
+        Without since, every bucket and the totals are rebuilt. With since, only
+        buckets from that day on are refolded through the time indexes, which
+        is the cheap incremental pass that keeps recent days exact. Waits for
+        any reconcile already running rather than overlapping it.
+        """
+        async with self._reconcile_lock:
+            return await self._rebuild(since)
+
+    async def _rebuild(self, since: Optional[datetime] = None) -> Dict[str, Any]:
+        since = day_start(since) if since else None
+        self._deferred = []
+        as_of = None
+        try:
+            # Increments already issued land before the cutoff is taken
+            if self._recording:
+                await asyncio.wait(set(self._recording))
+            as_of = datetime.utcnow()
+            return await self._refold(since, as_of)
+        finally:
+            deferred, self._deferred = self._deferred, None
+            for kind, moment, count, rating in deferred:
+                if as_of is None or moment >= as_of or (since and moment < since):
+                    # Rows the refold did not count or overwrite
+                    self._track_now(kind, moment, count, rating)
+                elif since:
+                    # Counted into a refolded bucket, but totals are not rebuilt
+                    self._track_now(kind, moment, count, rating, day=False)
+
+    async def _refold(self, since: Optional[datetime], as_of: datetime) -> Dict[str, Any]:
+        days: Dict[str, Dict[str, Any]] = {}
+        totals = dict.fromkeys(COUNTER_FIELDS, 0)
+        for kind in COUNTED_COLLECTIONS:
+            async for row in self.db[kind].aggregate(reconcile_pipeline(kind, since, before=as_of)):
+                totals[kind] += row["count"]
+                for field in ("rating_sum", "rating_count"):
+                    totals[field] += row.get(field, 0)
+                if row["_id"] is None:
+                    # Rows without a timestamp count towards totals only
+                    continue
+                bucket = days.setdefault(row["_id"], dict.fromkeys(COUNTER_FIELDS, 0))
+                bucket[kind] = row["count"]
+                if kind == "feedback":
+                    bucket["rating_sum"] = row["rating_sum"]
+                    bucket["rating_count"] = row["rating_count"]
+
+        # Buckets whose rows were all deleted are zeroed rather than left stale
+        existing = [
+            doc["_id"] for doc in await self.collection.find(day_buckets_query(since), {"_id": 1}).to_list(None)
+        ]
+        for key in existing:
+            days.setdefault(key[len("day:"):], dict.fromkeys(COUNTER_FIELDS, 0))
+
+        operations = [] if since else [
+            UpdateOne({"_id": "totals"}, {"$set": {**totals, "reconciled_at": datetime.utcnow()}}, upsert=True)
+        ]
+        for day, bucket in days.items():
+            operations.append(UpdateOne(
+                {"_id": f"day:{day}"},
+                {"$set": {**bucket, "kind": "day", "date": datetime.strptime(day, "%Y-%m-%d")}},
+                upsert=True
+            ))
+        for start in range(0, len(operations), 1000):
+            await self.collection.bulk_write(operations[start:start + 1000], ordered=False)
+        if since:
+            return {"days": len(days), "since": since}
+        return {"days": len(days), **totals}
+
+    async def run_forever(self, interval_seconds: float, rollup_interval_seconds: Optional[float] = None) -> None:
+        """Full reconcile every interval; in between, refold yesterday and today"""
+        rollup_interval_seconds = min(rollup_interval_seconds or interval_seconds, interval_seconds)
+        last_full = None
+        while True:
+            try:
+                now = datetime.utcnow()
+                if last_full is None or (now - last_full).total_seconds() >= interval_seconds:
+                    await self.reconcile()
+                    last_full = now
+                else:
+                    await self.reconcile(since=now - timedelta(days=1))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analytics reconciliation failed: {e}")
+            await asyncio.sleep(rollup_interval_seconds)
+
+    async def timeseries(self, metric: str, granularity: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Dense series of one metric over [start, end) from the day buckets"""
+        start, end = day_start(start), end
+        docs = await self.collection.find(
+            day_buckets_query(start, end),
+            {"_id": 0, "date": 1, **{field: 1 for field in COUNTER_FIELDS}}
+        ).sort(DAY_ORDER).to_list(None)
+        by_day = {doc["date"]: doc for doc in docs}
+
+        # Fold days into their period, keeping empty periods as zeros
+        periods: Dict[datetime, Dict[str, float]] = {}
+        day = start
+        while day < end:
+            bucket = periods.setdefault(period_start(day, granularity), dict.fromkeys(COUNTER_FIELDS, 0))
+            doc = by_day.get(day)
+            if doc:
+                for field in COUNTER_FIELDS:
+                    bucket[field] += doc.get(field, 0)
+            day += timedelta(days=1)
+
+        points = []
+        for moment, bucket in periods.items():
+            if metric == "avg_rating":
+                value = round(bucket["rating_sum"] / bucket["rating_count"], 2) if bucket["rating_count"] else None
+            else:
+                value = bucket[metric]
+            points.append({"t": moment, "value": value})
+        return points
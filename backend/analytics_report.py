@@ -0,0 +1,120 @@
+"""
+Vectorized owner analytics report
+Feedback and contact rows are streamed from projected cursors straight into
+column lists, converted once to NumPy arrays (strings factorized to integer
+codes) and summarized with array operations: rating histogram and
+percentiles, an NPS-style score, recommendation rates by category and
+budget/timeline cross-tabs.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column -> value used when a document lacks the field
+FEEDBACK_COLUMNS = {"category": "unknown", "rating": None, "wouldRecommend": False}
+CONTACT_COLUMNS = {"projectType": "unknown", "budget": "unknown", "timeline": "unknown",
+                   "urgency": "unknown", "status": "new"}
+PERCENTILES = (25, 50, 75, 90)
+
+
+async def load_columns(collection, columns: Dict[str, Any], query: Optional[Dict[str, Any]] = None) -> Dict[str, List[Any]]:
+    """Fill one list per column from a projected cursor; no per-row dicts are kept"""
+    data: Dict[str, List[Any]] = {column: [] for column in columns}
+    projection = {"_id": 0, **{column: 1 for column in columns}}
+    async for doc in collection.find(query or {}, projection).batch_size(5000):
+        for column, default in columns.items():
+            value = doc.get(column)
+            data[column].append(default if value is None else value)
+    return data
+
+
+def factorize(values: List[Any]):
+    """Integer codes plus the distinct labels they index"""
+    codes, labels = pd.factorize(np.array(values, dtype=object))
+    return codes, [str(label) for label in labels]
+
+
+def value_counts(values: List[Any]) -> Dict[str, int]:
+    codes, labels = factorize(values)
+    counts = np.bincount(codes, minlength=len(labels))
+    order = np.argsort(-counts, kind="stable")
+    return {labels[i]: int(counts[i]) for i in order}
+
+
+def feedback_report(columns: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """count and by_category[*].count cover every row; rated is the base of the
+    rating figures (histogram, mean, percentiles, nps)"""
+    ratings = np.array(columns["rating"], dtype=float)
+    count = int(ratings.size)
+    rated = ~np.isnan(ratings)
+    valid = np.clip(ratings[rated], 1, 5).astype(np.int64)
+    total = int(valid.size)
+    if count == 0:
+        return {"count": 0, "rated": 0, "histogram": {str(r): 0 for r in range(1, 6)}, "mean": None,
+                "percentiles": None, "nps": None, "recommend_rate": None, "by_category": {}}
+
+    histogram = np.bincount(valid, minlength=6)[1:]
+    # On a 1-5 scale: 5 promotes, 4 is passive, 1-3 detract
+    promoters = int(histogram[4])
+    detractors = int(histogram[:3].sum())
+
+    recommends = np.array(columns["wouldRecommend"], dtype=bool)
+    codes, categories = factorize(columns["category"])
+    size = len(categories)
+    rows = np.bincount(codes, minlength=size)
+    recommended = np.bincount(codes, weights=recommends, minlength=size)
+    rating_sum = np.bincount(codes[rated], weights=valid, minlength=size)
+    rating_count = np.bincount(codes[rated], minlength=size)
+    return {
+        "count": count,
+        "rated": total,
+        "histogram": {str(r): int(n) for r, n in zip(range(1, 6), histogram)},
+        "mean": round(float(valid.mean()), 3) if total else None,
+        "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(valid, PERCENTILES))} if total else None,
+        "nps": round((promoters - detractors) / total * 100, 1) if total else None,
+        "recommend_rate": round(float(recommends.mean()), 3),
+        "by_category": {
+            category: {
+                "count": int(rows[i]),
+                "recommend_rate": round(float(recommended[i] / rows[i]), 3),
+                "avg_rating": round(float(rating_sum[i] / rating_count[i]), 3) if rating_count[i] else None
+            }
+            for i, category in enumerate(categories)
+        }
+    }
+
+
+def contacts_report(columns: Dict[str, List[Any]]) -> Dict[str, Any]:
+    count = len(columns["budget"])
+    if count == 0:
+        return {"count": 0, "budget_by_timeline": {}, "by_project_type": {}, "by_urgency": {}, "by_status": {}}
+    budget_codes, budgets = factorize(columns["budget"])
+    timeline_codes, timelines = factorize(columns["timeline"])
+    # One bincount over the combined code is the whole cross-tab
+    crosstab = np.bincount(
+        budget_codes * len(timelines) + timeline_codes, minlength=len(budgets) * len(timelines)
+    ).reshape(len(budgets), len(timelines))
+    return {
+        "count": count,
+        "budget_by_timeline": {
+            budget: {timeline: int(crosstab[b, t]) for t, timeline in enumerate(timelines) if crosstab[b, t]}
+            for b, budget in enumerate(budgets)
+        },
+        "by_project_type": value_counts(columns["projectType"]),
+        "by_urgency": value_counts(columns["urgency"]),
+        "by_status": value_counts(columns["status"])
+    }
+
+
+async def build_report(db, query: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    feedback, contacts = await asyncio.gather(
+        load_columns(db.feedback, FEEDBACK_COLUMNS, query),
+        load_columns(db.contacts, CONTACT_COLUMNS, query)
+    )
+    # The number crunching runs off the event loop
+    return {
+        "feedback": await asyncio.to_thread(feedback_report, feedback),
+        "contacts": await asyncio.to_thread(contacts_report, contacts)
+    }
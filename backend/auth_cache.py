@@ -0,0 +1,61 @@
+"""
+Verified JWT cache for the owner auth dependency
+Remembers the claims of tokens that already passed signature verification,
+keyed by a digest of the token, so repeat requests from the editor skip HMAC
+verification and claim parsing. Entries expire with the token's exp claim.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        # digest -> (claims, exp timestamp)
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for a verified, unexpired token"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache claims of a token that just passed verification"""
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            # Without an expiry there is no safe moment to evict the entry
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (claims, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache instance
+verified_tokens = VerifiedTokenCache(max_size=int(os.environ.get("AUTH_CACHE_SIZE", "1024")))
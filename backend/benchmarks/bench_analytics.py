@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Analytics endpoint benchmark
+Seeds a scratch database with feedback, contacts and subscribers at each size
+and compares the previous sequential get_analytics (five awaits, ratings
+averaged in Python over the first 100 recent rows) with compute_analytics.
+Needs a running MongoDB; the scratch database is dropped afterwards.
+
+Usage: python backend/benchmarks/bench_analytics.py [--mongo-url mongodb://localhost:27017]
+           [--sizes 10000 100000 1000000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analytics import compute_analytics  # noqa: E402
+
+SEED_BATCH = 10000
+
+
+async def legacy_analytics(db):
+    subscribers_count = await db.subscribers.count_documents({})
+    feedback_count = await db.feedback.count_documents({})
+    contacts_count = await db.contacts.count_documents({})
+    recent_feedback = await db.feedback.find(
+        {"timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}}
+    ).to_list(100)
+    avg_rating = sum(f.get("rating", 0) for f in recent_feedback) / len(recent_feedback) if recent_feedback else 0
+    return {
+        "subscribers": subscribers_count,
+        "feedback": feedback_count,
+        "contacts": contacts_count,
+        "avg_rating": round(avg_rating, 1),
+        "recent_activity": {
+            "feedback_30d": len(recent_feedback),
+            "contacts_30d": await db.contacts.count_documents({
+                "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
+            })
+        }
+    }
+
+
+async def seed(db, current: int, target: int) -> None:
+    now = datetime.utcnow()
+    for start in range(current, target, SEED_BATCH):
+        count = min(SEED_BATCH, target - start)
+        stamps = [now - timedelta(minutes=random.randint(0, 365 * 24 * 60)) for _ in range(count)]
+        await asyncio.gather(
+            db.feedback.insert_many([
+                {"id": str(uuid.uuid4()), "name": "n", "email": "e@example.com", "category": "general",
+                 "rating": random.randint(1, 5), "message": "m", "wouldRecommend": True,
+                 "contactBack": False, "timestamp": ts}
+                for ts in stamps
+            ], ordered=False),
+            db.contacts.insert_many([
+                {"id": str(uuid.uuid4()), "name": "n", "email": "e@example.com", "projectType": "mvp",
+                 "budget": "under-25k", "timeline": "1-week", "message": "m", "preferredContact": "email",
+                 "urgency": "normal", "status": "new", "timestamp": ts}
+                for ts in stamps
+            ], ordered=False),
+            db.subscribers.insert_many([
+                {"id": str(uuid.uuid4()), "email": f"s{start + i}@example.com", "subscribed_at": ts}
+                for i, ts in enumerate(stamps)
+            ], ordered=False)
+        )
+
+
+async def timed(fn, db, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn(db)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="analytics_benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name]
+    await client.drop_database(args.db_name)
+    # Same indexes the server creates at startup
+    await db.feedback.create_index([("timestamp", 1), ("id", 1)])
+    await db.contacts.create_index([("timestamp", 1), ("id", 1)])
+
+    print(f"{'documents':>10}{'sequential ms':>16}{'concurrent ms':>16}{'speedup':>9}")
+    seeded = 0
+    try:
+        for size in sorted(args.sizes):
+            await seed(db, seeded, size)
+            seeded = size
+            legacy = await timed(legacy_analytics, db, args.repeat)
+            current = await timed(compute_analytics, db, args.repeat)
+            print(f"{size:>10}{legacy:>16.1f}{current:>16.1f}{legacy / current:>8.1f}x")
+    finally:
+        await client.drop_database(args.db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Auth dependency microbenchmark
+Compares verifying the owner JWT on every request (jwt.decode, the previous
+path) with the verified-token cache hit path used by verify_token.
+
+Usage: python backend/benchmarks/bench_auth.py [--iterations 100000]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import jwt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auth_cache import VerifiedTokenCache  # noqa: E402
+
+SECRET = "benchmark-secret"
+
+
+def decode_every_time(token: str) -> dict:
+    payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+    if payload.get("role") != "owner":
+        raise PermissionError
+    return payload
+
+
+def cached(cache: VerifiedTokenCache, token: str) -> dict:
+    payload = cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+        cache.put(token, payload)
+    if payload.get("role") != "owner":
+        raise PermissionError
+    return payload
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    token = jwt.encode({"role": "owner", "exp": now + timedelta(hours=24), "iat": now}, SECRET, algorithm="HS256")
+    cache = VerifiedTokenCache()
+
+    decode_time = timed(lambda: decode_every_time(token), args.iterations)
+    cached_time = timed(lambda: cached(cache, token), args.iterations)
+
+    print(f"{'path':<22}{'total s':>10}{'per call us':>14}")
+    print(f"{'jwt.decode':<22}{decode_time:>10.3f}{decode_time / args.iterations * 1e6:>14.2f}")
+    print(f"{'verified-token cache':<22}{cached_time:>10.3f}{cached_time / args.iterations * 1e6:>14.2f}")
+    print(f"speedup: {decode_time / cached_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Subscriber Bloom filter benchmark
+Fills the filter to capacity at several configured false-positive rates and
+reports lookup cost, the measured false-positive rate and memory compared
+with holding the emails in a Python set.
+
+Usage: python backend/benchmarks/bench_bloom.py [--capacity 100000] [--probes 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bloom import BloomFilter  # noqa: E402
+
+
+def set_size_bytes(items: set) -> int:
+    return sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--capacity", type=int, default=100000)
+    parser.add_argument("--probes", type=int, default=100000)
+    args = parser.parse_args()
+
+    emails = [f"subscriber{i}@example.com" for i in range(args.capacity)]
+    # Never inserted, so every hit among these is a false positive
+    unseen = [f"visitor{i}@example.org" for i in range(args.probes)]
+    print(f"python set of {args.capacity} emails: {set_size_bytes(set(emails)) / 1024:.0f} KiB")
+    print(f"{'fp_rate':>8}{'KiB':>9}{'hashes':>8}{'add us':>9}{'lookup us':>11}{'measured fp':>13}")
+
+    for fp_rate in (0.1, 0.01, 0.001, 0.0001):
+        bloom = BloomFilter(args.capacity, fp_rate)
+        start = time.perf_counter()
+        for email in emails:
+            bloom.add(email)
+        add_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        false_positives = sum(1 for email in unseen if email in bloom)
+        lookup_time = time.perf_counter() - start
+
+        print(
+            f"{fp_rate:>8}{bloom.size_bytes / 1024:>9.0f}{bloom.num_hashes:>8}"
+            f"{add_time / args.capacity * 1e6:>9.2f}{lookup_time / args.probes * 1e6:>11.2f}"
+            f"{false_positives / args.probes:>13.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Analytics report benchmark
+Builds the feedback and contact sections of the owner report from synthetic
+rows, once with the vectorized NumPy/pandas functions used by the endpoint and
+once with an equivalent pure-Python loop over the documents.
+
+Usage: python backend/benchmarks/bench_report.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analytics_report import CONTACT_COLUMNS, FEEDBACK_COLUMNS, contacts_report, feedback_report  # noqa: E402
+
+CATEGORIES = ["general", "project", "hiring", "design"]
+BUDGETS = ["under-25k", "25k-50k", "50k-100k", "100k-plus"]
+TIMELINES = ["1-week", "2-4-weeks", "1-3-months", "flexible"]
+
+
+def percentile(sorted_values, p):
+    # Linear interpolation, matching numpy's default
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def python_report(feedback, contacts):
+    ratings = sorted(min(5, max(1, d["rating"])) for d in feedback)
+    histogram = Counter(ratings)
+    categories = defaultdict(lambda: [0, 0, 0])
+    for d in feedback:
+        stats = categories[d["category"]]
+        stats[0] += 1
+        stats[1] += bool(d["wouldRecommend"])
+        stats[2] += d["rating"]
+    promoters = histogram[5]
+    detractors = histogram[1] + histogram[2] + histogram[3]
+    crosstab = defaultdict(Counter)
+    for d in contacts:
+        crosstab[d["budget"]][d["timeline"]] += 1
+    return {
+        "histogram": [histogram[r] for r in range(1, 6)],
+        "mean": sum(ratings) / len(ratings),
+        "percentiles": [percentile(ratings, p) for p in (25, 50, 75, 90)],
+        "nps": (promoters - detractors) / len(ratings) * 100,
+        "by_category": {c: (n, rec / n, total / n) for c, (n, rec, total) in categories.items()},
+        "crosstab": crosstab,
+        "by_project_type": Counter(d["projectType"] for d in contacts),
+        "by_urgency": Counter(d["urgency"] for d in contacts),
+        "by_status": Counter(d["status"] for d in contacts)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'python ms':>12}{'vectorized ms':>15}{'speedup':>9}")
+    for rows in args.rows:
+        feedback = [
+            {"category": random.choice(CATEGORIES), "rating": random.randint(1, 5),
+             "wouldRecommend": random.random() < 0.7}
+            for _ in range(rows)
+        ]
+        contacts = [
+            {"projectType": "mvp", "budget": random.choice(BUDGETS), "timeline": random.choice(TIMELINES),
+             "urgency": random.choice(["normal", "urgent"]), "status": "new"}
+            for _ in range(rows)
+        ]
+        # The endpoint fills these column lists straight from the cursor
+        feedback_columns = {c: [d[c] for d in feedback] for c in FEEDBACK_COLUMNS}
+        contact_columns = {c: [d[c] for d in contacts] for c in CONTACT_COLUMNS}
+
+        start = time.perf_counter()
+        python_report(feedback, contacts)
+        python_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        feedback_report(feedback_columns)
+        contacts_report(contact_columns)
+        vectorized_time = time.perf_counter() - start
+
+        print(f"{rows:>9}{python_time * 1000:>12.1f}{vectorized_time * 1000:>15.1f}{python_time / vectorized_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the portfolio API
+Compares FastAPI's default path (jsonable_encoder + stdlib json via
+JSONResponse) with FastJSONResponse on payloads shaped like each endpoint.
+
+Usage: python backend/benchmarks/bench_serialization.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from responses import FastJSONResponse, orjson  # noqa: E402
+
+
+def feedback_payload(rows: int):
+    now = datetime.utcnow()
+    return {
+        "count": rows,
+        "feedback": [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"Reviewer {i}",
+                "email": f"reviewer{i}@example.com",
+                "company": "Acme Inc" if i % 3 else None,
+                "category": ["general", "project", "hiring"][i % 3],
+                "rating": i % 5 + 1,
+                "message": "Great work on the project, delivered fast and clean. " * 3,
+                "wouldRecommend": i % 4 != 0,
+                "contactBack": i % 2 == 0,
+                "timestamp": now - timedelta(minutes=i)
+            } for i in range(rows)
+        ]
+    }
+
+
+def contacts_payload(rows: int):
+    now = datetime.utcnow()
+    return {
+        "count": rows,
+        "contacts": [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"Lead {i}",
+                "email": f"lead{i}@example.com",
+                "company": "Startup Co",
+                "phone": "+1 555 0100",
+                "projectType": "mvp",
+                "budget": "under-25k",
+                "timeline": "1-week",
+                "message": "We need an MVP built with React and FastAPI. " * 4,
+                "preferredContact": "email",
+                "urgency": "normal",
+                "status": "new",
+                "timestamp": now - timedelta(minutes=i)
+            } for i in range(rows)
+        ]
+    }
+
+
+def subscribers_payload(rows: int):
+    now = datetime.utcnow()
+    return {
+        "count": rows,
+        "subscribers": [
+            {"email": f"subscriber{i}@example.com", "subscribed_at": now - timedelta(minutes=i)}
+            for i in range(rows)
+        ]
+    }
+
+
+def content_payload(rows: int):
+    return {
+        "hero": {"name": "Abhishek Kolluri", "title": "Full Stack Developer", "tagline": "Ships fast"},
+        "about": {"description": "Passionate developer " * 20},
+        "freelance": {"available": True},
+        "projects": {"featured": [
+            {"name": f"Project {i}", "description": "A project " * 10, "tech": ["React", "FastAPI"]}
+            for i in range(min(rows, 50))
+        ]},
+        "skills": ["Python", "JavaScript", "React", "FastAPI", "MongoDB"] * 4,
+        "experience": [{"company": f"Company {i}", "role": "Engineer"} for i in range(10)],
+        "hackathons": [{"name": f"Hack {i}", "position": "Winner"} for i in range(10)],
+        "certs": ["AWS Certified Developer"] * 5,
+        "education": {"degree": "Computer Science"},
+        "contact": {"email": "owner@example.com"},
+        "updated_at": datetime.utcnow()
+    }
+
+
+def default_path(payload):
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_path(payload):
+    return FastJSONResponse(payload).body
+
+
+def best_of(fn, payload, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list endpoint (the to_list cap)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; FastJSONResponse falls back to the stdlib encoder")
+
+    endpoints = {
+        "GET /api/feedback": feedback_payload(args.rows),
+        "GET /api/contacts": contacts_payload(args.rows),
+        "GET /api/subscribers": subscribers_payload(args.rows),
+        "GET /api/content": content_payload(args.rows),
+    }
+
+    print(f"{'endpoint':<22}{'bytes':>10}{'default ms':>12}{'orjson ms':>12}{'speedup':>9}")
+    for name, payload in endpoints.items():
+        assert default_path(payload) == fast_path(payload), f"{name}: outputs differ"
+        default_time = best_of(default_path, payload, args.repeat)
+        fast_time = best_of(fast_path, payload, args.repeat)
+        print(
+            f"{name:<22}{len(fast_path(payload)):>10}"
+            f"{default_time * 1000:>12.3f}{fast_time * 1000:>12.3f}"
+            f"{default_time / fast_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
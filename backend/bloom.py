@@ -0,0 +1,86 @@
+"""
+Bloom filter front for subscriber existence checks
+Keeps a compact in-memory set of subscribed email hashes. A miss is definite,
+so subscribe can go straight to a plain insert; a hit may be a false positive
+and still goes through the authoritative unique-index upsert.
+"""
+import hashlib
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        if capacity < 1 or not 0 < fp_rate < 1:
+            raise ValueError("capacity must be positive and fp_rate in (0, 1)")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        # Optimal sizing: m = -n ln p / (ln 2)^2 bits, k = m/n ln 2 hashes
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        # Kirsch-Mitzenmacher double hashing: k positions from two hashes
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def saturated(self) -> bool:
+        """Past capacity the false-positive rate climbs above fp_rate"""
+        return self.count > self.capacity
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+
+class SubscriberFilter:
+    """Bloom filter of subscriber emails that answers 'maybe' until warmed"""
+
+    def __init__(self, capacity: int = 100000, fp_rate: float = 0.01, enabled: bool = True):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.enabled = enabled
+        self.filter = None
+        self.ready = False
+
+    async def warm(self, collection, batch_size: int = 5000) -> int:
+        """Load every stored email; inserts racing the scan land in the same filter"""
+        self.ready = False
+        existing = await collection.estimated_document_count()
+        # Headroom so steady growth does not saturate the filter before restart
+        self.filter = BloomFilter(max(self.capacity, existing * 2), self.fp_rate)
+        async for doc in collection.find({}, {"_id": 0, "email": 1}).batch_size(batch_size):
+            if doc.get("email"):
+                self.filter.add(doc["email"])
+        self.ready = True
+        logger.info(
+            f"Subscriber filter warmed with {self.filter.count} emails "
+            f"({self.filter.size_bytes} bytes, {self.filter.num_hashes} hashes)"
+        )
+        return self.filter.count
+
+    def might_contain(self, email: str) -> bool:
+        if not (self.enabled and self.ready):
+            return True
+        return email in self.filter
+
+    def add(self, email: str) -> None:
+        if self.filter is not None:
+            self.filter.add(email)
+            if self.filter.count == self.filter.capacity + 1:
+                logger.warning("Subscriber filter is past capacity; false positives will rise until restart")
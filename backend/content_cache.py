@@ -0,0 +1,109 @@
+"""
+In-process cache for the public portfolio content document
+Keeps the GET /api/content payload and each section as pre-serialized,
+pre-compressed snapshots with strong ETags so page loads don't need a Mongo
+round-trip or any encoding work; save_content refreshes it write-through.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from responses import dumps
+from snapshots import ResponseSnapshot, compute_etag
+
+
+class ContentCache:
+    def __init__(self, ttl_seconds: float = 60.0):
+        # The TTL only bounds staleness when several workers share one database;
+        # within a single process save_content keeps the entry current.
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[ResponseSnapshot] = None
+        self._loaded_at = 0.0
+        self._payload: Optional[Dict[str, Any]] = None
+        # section name -> (snapshot, loaded_at)
+        self._sections: Dict[str, tuple] = {}
+        # Bumped whenever the document changes; a section read that started
+        # under an older generation is served but not cached
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _within_ttl(self, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at < self.ttl_seconds
+
+    def is_fresh(self) -> bool:
+        return self._snapshot is not None and self._within_ttl(self._loaded_at)
+
+    async def set(self, payload: Dict[str, Any]) -> str:
+        """Store a new payload and return its ETag
+
+        Takes the reload lock, so a TTL reload that read the document before
+        a save finishes first and the write-through lands after it.
+        """
+        async with self._lock:
+            return await self._store(payload)
+
+    async def _store(self, payload: Dict[str, Any]) -> str:
+        # An unchanged body (e.g. a TTL reload) keeps the existing snapshot and
+        # section snapshots, so compression only reruns when content changes
+        body = dumps(payload)
+        if self._snapshot is None or self._snapshot.etag != compute_etag(body):
+            self._snapshot = await ResponseSnapshot.create(body)
+            self._sections = {}
+            self._generation += 1
+        self._loaded_at = time.monotonic()
+        self._payload = payload
+        return self._snapshot.etag
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._payload = None
+        self._sections = {}
+        self._generation += 1
+
+    async def get(self, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> ResponseSnapshot:
+        """Return the document snapshot, calling loader at most once per refresh"""
+        if self.is_fresh():
+            return self._snapshot
+
+        async with self._lock:
+            # Another request may have refreshed the entry while we waited
+            if not self.is_fresh():
+                await self._store(await loader())
+            return self._snapshot
+
+    async def get_payload(self, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return the cached document itself (treat as read-only)"""
+        await self.get(loader)
+        return self._payload
+
+    async def _set_section(self, name: str, value: Any, loaded_at: float, generation: int) -> ResponseSnapshot:
+        body = dumps(value)
+        entry = self._sections.get(name)
+        if entry is not None and entry[0].etag == compute_etag(body):
+            snapshot = entry[0]
+        else:
+            snapshot = await ResponseSnapshot.create(body)
+        if generation == self._generation:
+            self._sections[name] = (snapshot, loaded_at)
+        return snapshot
+
+    async def get_section(
+        self, name: str, loader: Callable[[str], Awaitable[Any]]
+    ) -> ResponseSnapshot:
+        """Return the snapshot for one section; loader(name) returns its value"""
+        entry = self._sections.get(name)
+        if entry is not None and self._within_ttl(entry[1]):
+            return entry[0]
+
+        # Slice the cached full document before falling back to the database
+        generation = self._generation
+        if self.is_fresh() and self._payload is not None and name in self._payload:
+            return await self._set_section(name, self._payload[name], self._loaded_at, generation)
+        loaded_at = time.monotonic()
+        return await self._set_section(name, await loader(name), loaded_at, generation)
+
+
+# Global cache instance
+content_cache = ContentCache(ttl_seconds=float(os.environ.get("CONTENT_CACHE_TTL", "60")))
@@ -0,0 +1,161 @@
+"""
+Partial portfolio content updates
+Applies RFC 6902 JSON Patch operations (or a plain section map) to the stored
+content and reduces them to the smallest set of MongoDB $set/$unset paths.
+"""
+import copy
+from typing import Any, Dict, List, Set, Tuple
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch cannot be applied to the current document"""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split a JSON Pointer (RFC 6901) into unescaped reference tokens"""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    tokens = [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+    for token in tokens:
+        # MongoDB cannot address keys like these with dotted paths
+        if "." in token or token.startswith("$"):
+            raise JsonPatchError(f"Unsupported key in path: {token!r}")
+    return tokens
+
+
+def _array_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve_parent(doc: Dict[str, Any], tokens: List[str]) -> Tuple[Any, List[str]]:
+    """Return the container holding the last token and the path walked so far"""
+    if not tokens:
+        raise JsonPatchError("Patching the document root is not supported")
+    node: Any = doc
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_array_index(node, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node, tokens[:-1]
+
+
+def _get(doc: Dict[str, Any], tokens: List[str]) -> Any:
+    parent, _ = _resolve_parent(doc, tokens)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent[key]
+    if isinstance(parent, list):
+        return parent[_array_index(parent, key, allow_end=False)]
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _add(doc: Dict[str, Any], tokens: List[str], value: Any) -> List[str]:
+    parent, parent_tokens = _resolve_parent(doc, tokens)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+        return tokens
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+        # Inserting shifts later elements, so the whole array is rewritten
+        return parent_tokens
+    raise JsonPatchError(f"Cannot add to non-container at /{'/'.join(tokens)}")
+
+
+def _remove(doc: Dict[str, Any], tokens: List[str]) -> List[str]:
+    parent, parent_tokens = _resolve_parent(doc, tokens)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        del parent[key]
+        return tokens
+    if isinstance(parent, list):
+        del parent[_array_index(parent, key, allow_end=False)]
+        return parent_tokens
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _replace(doc: Dict[str, Any], tokens: List[str], value: Any) -> List[str]:
+    parent, _ = _resolve_parent(doc, tokens)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent[_array_index(parent, key, allow_end=False)] = value
+    else:
+        raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return tokens
+
+
+def apply_patch(doc: Dict[str, Any], operations: List[Dict[str, Any]]) -> Set[Tuple[str, ...]]:
+    """Apply operations to doc in place and return the paths that changed"""
+    touched: Set[Tuple[str, ...]] = set()
+    for operation in operations:
+        op = operation.get("op")
+        tokens = parse_pointer(operation.get("path", ""))
+
+        if op == "add":
+            touched.add(tuple(_add(doc, tokens, copy.deepcopy(operation.get("value")))))
+        elif op == "remove":
+            touched.add(tuple(_remove(doc, tokens)))
+        elif op == "replace":
+            touched.add(tuple(_replace(doc, tokens, copy.deepcopy(operation.get("value")))))
+        elif op in ("move", "copy"):
+            from_tokens = parse_pointer(operation.get("from", ""))
+            if op == "move" and tokens[:len(from_tokens)] == from_tokens:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            value = copy.deepcopy(_get(doc, from_tokens))
+            if op == "move":
+                touched.add(tuple(_remove(doc, from_tokens)))
+            touched.add(tuple(_add(doc, tokens, value)))
+        elif op == "test":
+            if _get(doc, tokens) != operation.get("value"):
+                raise JsonPatchError(f"Test failed at {operation.get('path')}")
+        else:
+            raise JsonPatchError(f"Unsupported operation: {op!r}")
+    return touched
+
+
+def sections_to_operations(sections: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Express a {section: value} map as JSON Patch operations"""
+    return [
+        {"op": "add", "path": "/" + name.replace("~", "~0").replace("/", "~1"), "value": value}
+        for name, value in sections.items()
+    ]
+
+
+def build_update(doc: Dict[str, Any], touched: Set[Tuple[str, ...]]) -> Dict[str, Dict[str, Any]]:
+    """Turn touched paths into non-overlapping $set/$unset clauses"""
+    # MongoDB rejects updates where one path is a prefix of another, and the
+    # ancestor's new value already contains every nested change anyway
+    paths = [p for p in touched if p and not any(q != p and p[:len(q)] == q for q in touched)]
+
+    update: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(paths):
+        try:
+            value = _get(doc, list(path))
+        except JsonPatchError:
+            update.setdefault("$unset", {})[".".join(path)] = ""
+        else:
+            update.setdefault("$set", {})[".".join(path)] = value
+    return update
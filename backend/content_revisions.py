@@ -0,0 +1,122 @@
+"""
+Revision history for the portfolio content document
+Each save stores only the sections that changed (zlib-compressed when that
+pays off), with a full snapshot every few revisions so any revision can be
+rebuilt from the nearest snapshot plus the deltas after it.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReturnDocument
+
+NEWEST_FIRST = [("revision", -1)]
+OLDEST_FIRST = [("revision", 1)]
+
+
+def history_query(before: Optional[int] = None) -> Dict[str, Any]:
+    return {"revision": {"$lt": before}} if before else {}
+
+
+def revision_query(revision: int) -> Dict[str, Any]:
+    return {"revision": revision}
+
+
+def snapshot_query(revision: int) -> Dict[str, Any]:
+    """Snapshots at or before a revision; the newest one is the rebuild base"""
+    return {"kind": "snapshot", "revision": {"$lte": revision}}
+
+
+def delta_query(snapshot_revision: int, revision: int) -> Dict[str, Any]:
+    return {"kind": "delta", "revision": {"$gt": snapshot_revision, "$lte": revision}}
+
+
+class ContentRevisionStore:
+    def __init__(self, revisions, counters, snapshot_interval: int = 20, compress_threshold: int = 512):
+        self.revisions = revisions
+        self.counters = counters
+        self.snapshot_interval = max(1, snapshot_interval)
+        # Payloads smaller than this are stored as plain JSON; zlib headers
+        # would outweigh the savings
+        self.compress_threshold = compress_threshold
+
+    async def next_revision(self) -> int:
+        """Allocate the next content revision number"""
+        counter = await self.counters.find_one_and_update(
+            {"_id": "content_revision"},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["seq"]
+
+    async def current_revision(self) -> int:
+        counter = await self.counters.find_one({"_id": "content_revision"})
+        return counter["seq"] if counter else 0
+
+    def encode(self, sections: Dict[str, Any]) -> Dict[str, Any]:
+        raw = json.dumps(sections, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        if len(raw) >= self.compress_threshold:
+            compressed = zlib.compress(raw, 6)
+            if len(compressed) < len(raw):
+                return {"payload": compressed, "compression": "zlib", "size": len(raw), "stored_size": len(compressed)}
+        return {"payload": raw, "compression": None, "size": len(raw), "stored_size": len(raw)}
+
+    @staticmethod
+    def decode(revision_doc: Dict[str, Any]) -> Dict[str, Any]:
+        raw = revision_doc["payload"]
+        if revision_doc.get("compression") == "zlib":
+            raw = zlib.decompress(raw)
+        return json.loads(raw)
+
+    def is_snapshot_due(self, revision: int) -> bool:
+        # Revision 1 is always a snapshot so history never starts with a delta
+        return revision == 1 or revision % self.snapshot_interval == 0
+
+    async def record(
+        self,
+        revision: int,
+        changed: Dict[str, Any],
+        document: Dict[str, Any],
+        section_names: Iterable[str],
+        updated_by: str = "owner",
+        restored_from: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Store revision as a delta of changed sections, or a full snapshot when due"""
+        if self.is_snapshot_due(revision):
+            kind = "snapshot"
+            sections = {name: document[name] for name in section_names if name in document}
+        else:
+            kind = "delta"
+            sections = changed
+
+        revision_doc = {
+            "revision": revision,
+            "kind": kind,
+            "sections": sorted(sections),
+            "changed": sorted(changed),
+            "created_at": datetime.utcnow(),
+            "updated_by": updated_by,
+            "restored_from": restored_from,
+            **self.encode(sections)
+        }
+        await self.revisions.insert_one(revision_doc)
+        return revision_doc
+
+    async def list_revisions(self, limit: int = 50, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return revision metadata, newest first, without payloads"""
+        cursor = self.revisions.find(history_query(before), {"_id": 0, "payload": 0}).sort(NEWEST_FIRST).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def rebuild(self, revision: int) -> Dict[str, Any]:
+        """Rebuild the content sections as they were at the given revision"""
+        snapshot = await self.revisions.find_one(snapshot_query(revision), sort=NEWEST_FIRST)
+        if snapshot is None or not await self.revisions.find_one(revision_query(revision), {"_id": 1}):
+            raise LookupError(revision)
+
+        sections = self.decode(snapshot)
+        cursor = self.revisions.find(delta_query(snapshot["revision"], revision)).sort(OLDEST_FIRST)
+        async for delta in cursor:
+            sections.update(self.decode(delta))
+        return sections
@@ -0,0 +1,205 @@
+"""
+Declarative index registry
+Every index the app relies on is declared here once, applied idempotently at
+startup, and can be inspected or diffed against a live database with
+manage_indexes.py. Each entry notes the queries it serves.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from pymongo.errors import OperationFailure
+
+from search import SEARCH_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    keys: Tuple[Tuple[str, Any], ...]
+    name: Optional[str] = None
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None
+    # Text indexes only: (field, weight) pairs
+    weights: Tuple[Tuple[str, int], ...] = ()
+
+    @property
+    def index_name(self) -> str:
+        # Same default name pymongo derives from the key pattern
+        return self.name or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    @property
+    def is_text(self) -> bool:
+        return any(direction == "text" for _, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.index_name}
+        if self.unique:
+            options["unique"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.weights:
+            options["weights"] = dict(self.weights)
+        return options
+
+    def differences(self, existing: Dict[str, Any]) -> List[str]:
+        """Option mismatches against an index_information() entry"""
+        problems = []
+        if self.is_text:
+            if dict(existing.get("weights", {})) != dict(self.weights):
+                problems.append("weights")
+        elif [tuple(k) for k in existing["key"]] != [tuple(k) for k in self.keys]:
+            problems.append("key")
+        if bool(existing.get("unique")) != self.unique:
+            problems.append("unique")
+        if existing.get("expireAfterSeconds") != self.expire_after_seconds:
+            problems.append("expireAfterSeconds")
+        return problems
+
+
+def status_retention_registry(status_retention_days: int) -> Dict[str, List[IndexSpec]]:
+    """The raw heartbeat TTL on its own
+
+    The server applies it only once the rollup job has folded every row older
+    than the retention window, so a backlog is never expired unrolled.
+    """
+    ttl = int(timedelta(days=status_retention_days).total_seconds())
+    return {"status_checks": [IndexSpec((("timestamp", 1),), expire_after_seconds=ttl)]}
+
+
+def index_registry(
+    status_retention_days: int = 30,
+    rate_limits: bool = False,
+    text_search: bool = True,
+    status_retention: bool = True
+) -> Dict[str, List[IndexSpec]]:
+    registry: Dict[str, List[IndexSpec]] = {
+        "portfolio_content": [
+            # find_one({"type": "current"}) on every content read and save
+            IndexSpec((("type", 1),)),
+        ],
+        "content_revisions": [
+            # Revision lookups, history pages and delta replay
+            IndexSpec((("revision", 1),), unique=True),
+            # Nearest snapshot at or before a revision
+            IndexSpec((("kind", 1), ("revision", 1))),
+        ],
+        "subscribers": [
+            # Makes subscribe a single idempotent upsert
+            IndexSpec((("email", 1),), unique=True),
+            # Incremental analytics reconcile refolds recent days
+            IndexSpec((("subscribed_at", 1),)),
+        ],
+        "status_checks": [
+            # Keyset pagination of GET /api/status in either direction
+            IndexSpec((("timestamp", 1), ("id", 1))),
+        ],
+        "status_rollups": [
+            IndexSpec((("granularity", 1), ("bucket_start", 1), ("client_name", 1)), unique=True),
+            # Minute buckets carry expires_at; hour buckets are kept indefinitely
+            IndexSpec((("expires_at", 1),), expire_after_seconds=0),
+        ],
+        "feedback": [
+            # Listing filters first, then the keyset sort keys, so filtered
+            # pages and the 30-day analytics range are index range scans
+            IndexSpec((("timestamp", 1), ("id", 1))),
+            IndexSpec((("category", 1), ("timestamp", 1), ("id", 1))),
+            IndexSpec((("rating", 1), ("timestamp", 1), ("id", 1))),
+            IndexSpec((("category", 1), ("rating", 1), ("timestamp", 1), ("id", 1))),
+            # Search hydration selects by public id
+            IndexSpec((("id", 1),)),
+        ],
+        "contacts": [
+            IndexSpec((("timestamp", 1), ("id", 1))),
+            IndexSpec((("status", 1), ("timestamp", 1), ("id", 1))),
+            IndexSpec((("urgency", 1), ("timestamp", 1), ("id", 1))),
+            IndexSpec((("status", 1), ("urgency", 1), ("timestamp", 1), ("id", 1))),
+            # Bulk operations and search hydration select by public id
+            IndexSpec((("id", 1),)),
+        ],
+        "analytics_counters": [
+            # Time-series reads select day buckets by date range
+            IndexSpec((("kind", 1), ("date", 1))),
+        ],
+    }
+    if text_search:
+        # Ranked $text search; without it search falls back to in-process BM25
+        for collection in ("feedback", "contacts"):
+            registry[collection].append(IndexSpec(
+                tuple((field, "text") for field in SEARCH_WEIGHTS),
+                name=f"{collection}_text",
+                weights=tuple(SEARCH_WEIGHTS.items())
+            ))
+    if rate_limits:
+        # Idle buckets are dropped once they would have refilled completely
+        registry["rate_limits"] = [IndexSpec((("expires_at", 1),), expire_after_seconds=0)]
+    if status_retention:
+        registry["status_checks"] += status_retention_registry(status_retention_days)["status_checks"]
+    return registry
+
+
+def registry_from_env(environ: Mapping[str, str] = os.environ, status_retention: bool = True) -> Dict[str, List[IndexSpec]]:
+    """The registry for the configuration the server reads from its environment"""
+    return index_registry(
+        status_retention_days=int(environ.get("STATUS_RETENTION_DAYS", "30")),
+        rate_limits=environ.get("RATE_LIMIT_BACKEND", "memory") == "mongo",
+        text_search=environ.get("SEARCH_BACKEND", "auto") != "python",
+        status_retention=status_retention
+    )
+
+
+async def diff_indexes(db, registry: Dict[str, List[IndexSpec]]) -> Dict[str, Dict[str, List[str]]]:
+    """Per collection: declared indexes that are missing, differ, or are undeclared"""
+    report = {}
+    for collection, specs in registry.items():
+        existing = await db[collection].index_information()
+        declared = {spec.index_name: spec for spec in specs}
+        report[collection] = {
+            "missing": [name for name in declared if name not in existing],
+            "changed": [
+                f"{name} ({', '.join(problems)})"
+                for name, spec in declared.items()
+                if name in existing and (problems := spec.differences(existing[name]))
+            ],
+            "extra": [name for name in existing if name != "_id_" and name not in declared],
+        }
+    return report
+
+
+async def apply_indexes(db, registry: Dict[str, List[IndexSpec]]) -> List[Dict[str, Any]]:
+    """Create missing indexes and retune TTLs in place; never drops anything
+
+    A failure (e.g. a unique index blocked by legacy duplicates) is logged and
+    reported, and the remaining indexes are still applied.
+    """
+    results = []
+    for collection, specs in registry.items():
+        existing = await db[collection].index_information()
+        for spec in specs:
+            result = {"collection": collection, "index": spec.index_name}
+            current = existing.get(spec.index_name)
+            try:
+                if current is None:
+                    await db[collection].create_index(list(spec.keys), **spec.options())
+                    result["action"] = "created"
+                elif not spec.differences(current):
+                    result["action"] = "unchanged"
+                elif spec.differences(current) == ["expireAfterSeconds"] and spec.expire_after_seconds is not None:
+                    await db.command(
+                        "collMod", collection,
+                        index={"name": spec.index_name, "expireAfterSeconds": spec.expire_after_seconds}
+                    )
+                    result["action"] = "updated"
+                else:
+                    result["action"] = "conflict"
+                    result["error"] = f"differs in {', '.join(spec.differences(current))}; drop it to re-create"
+                    logger.error(f"Index {collection}.{spec.index_name} {result['error']}")
+            except OperationFailure as e:
+                result["action"] = "failed"
+                result["error"] = str(e)
+                logger.error(f"Could not apply index {collection}.{spec.index_name}: {e}")
+            results.append(result)
+    return results
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Index management CLI
+Compares the registry in indexes.py with a live database and applies it, using
+the same MONGO_URL / DB_NAME / STATUS_RETENTION_DAYS / RATE_LIMIT_BACKEND /
+SEARCH_BACKEND settings as the server (read from backend/.env).
+
+Usage: python backend/manage_indexes.py show
+       python backend/manage_indexes.py diff      # exit status 1 on drift
+       python backend/manage_indexes.py apply [--drop-extra]
+
+apply leaves out the status_checks TTL: the server creates it once the rollup
+job has caught up, so unrolled heartbeats are never expired. --drop-extra
+prunes against the same registry apply used and never drops that TTL.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from indexes import apply_indexes, diff_indexes, registry_from_env, status_retention_registry
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+def describe(info) -> str:
+    keys = ", ".join(f"{field}: {direction}" for field, direction in info["key"])
+    options = [name for name in ("unique", "sparse") if info.get(name)]
+    if "expireAfterSeconds" in info:
+        options.append(f"ttl={info['expireAfterSeconds']}s")
+    if "weights" in info:
+        options.append(f"weights={dict(info['weights'])}")
+    return f"{{ {keys} }}" + (f" [{', '.join(options)}]" if options else "")
+
+
+async def show(db, registry) -> int:
+    for collection in sorted(set(registry) | set(await db.list_collection_names())):
+        declared = {spec.index_name for spec in registry.get(collection, [])}
+        print(collection)
+        for name, info in sorted((await db[collection].index_information()).items()):
+            marker = " " if name == "_id_" or name in declared else "?"
+            print(f"  {marker} {name}: {describe(info)}")
+    print("\n? = not declared in the registry")
+    return 0
+
+
+async def diff(db, registry) -> int:
+    drift = False
+    for collection, report in (await diff_indexes(db, registry)).items():
+        # Changed entries already name the differing options
+        for kind, sign in (("missing", "+"), ("changed", "~"), ("extra", "-")):
+            for name in report[kind]:
+                drift = True
+                print(f"{sign} {collection}.{name}" + ("" if kind == "changed" else f" ({kind})"))
+    if not drift:
+        print("Indexes match the registry")
+    return 1 if drift else 0
+
+
+async def apply(db, registry, drop_extra: bool) -> int:
+    # Created by the server, not by this command, so never pruned here
+    server_managed = {
+        (collection, spec.index_name)
+        for collection, specs in status_retention_registry(int(os.environ.get('STATUS_RETENTION_DAYS', '30'))).items()
+        for spec in specs
+    }
+    failed = False
+    for result in await apply_indexes(db, registry):
+        line = f"{result['action']:>9}  {result['collection']}.{result['index']}"
+        if "error" in result:
+            failed = True
+            line += f": {result['error']}"
+        print(line)
+    if drop_extra:
+        for collection, report in (await diff_indexes(db, registry)).items():
+            for name in report["extra"]:
+                if (collection, name) in server_managed:
+                    continue
+                await db[collection].drop_index(name)
+                print(f"{'dropped':>9}  {collection}.{name}")
+    return 1 if failed else 0
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("command", choices=["show", "diff", "apply"])
+    parser.add_argument("--drop-extra", action="store_true",
+                        help="with apply, drop indexes that are not in the registry")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    # apply leaves the heartbeat TTL to the server; show and diff include it
+    registry = registry_from_env(status_retention=args.command != "apply")
+    try:
+        if args.command == "show":
+            return await show(db, registry)
+        if args.command == "diff":
+            return await diff(db, registry)
+        return await apply(db, registry, args.drop_extra)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,98 @@
+"""
+Keyset (cursor) pagination helpers for MongoDB listings
+A cursor encodes the sort-key values of the last row returned, so each page is
+an index range scan instead of a growing skip, and response time stays flat
+however large the collection gets.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    def encode(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {"$date": value.isoformat()}
+        return value
+
+    raw = json.dumps([encode(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict) and "$date" in value:
+            return datetime.fromisoformat(value["$date"])
+        return value
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [decode(v) for v in json.loads(raw)]
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if len(values) != expected_length or any(isinstance(v, (dict, list)) for v in values):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def projection_for(fields: Optional[str], allowed: Sequence[str]) -> Dict[str, int]:
+    """Turn a comma-separated fields= parameter into an inclusion projection"""
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(allowed)
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return {"_id": 0, **{field: 1 for field in requested}}
+
+
+def keyset_filter(sort: Sequence[Tuple[str, int]], values: Sequence[Any]) -> Dict[str, Any]:
+    """Build the filter selecting rows strictly after values in sort order"""
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {name: values[i] for i, (name, _) in enumerate(sort[:position])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def page_query(query: Dict[str, Any], sort: Sequence[Tuple[str, int]], cursor: Optional[str] = None) -> Dict[str, Any]:
+    """The filter fetch_page sends: query narrowed to rows after the cursor"""
+    if not cursor:
+        return query
+    after = keyset_filter(sort, decode_cursor(cursor, len(sort)))
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    sort: Sequence[Tuple[str, int]],
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of rows and the cursor for the next page (None at the end)
+
+    The last sort field must be unique (e.g. the document id) so ties on the
+    earlier fields are broken deterministically.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = page_query(query, sort, cursor)
+
+    if projection is not None and not any(v == 0 for k, v in projection.items() if k != "_id"):
+        # Inclusion projections must carry the sort keys to build the next cursor
+        projection = {**projection, **{field: 1 for field, _ in sort}}
+
+    # Fetch one extra row to learn whether another page exists
+    rows = await collection.find(query, projection).sort(list(sort)).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].get(field) for field, _ in sort])
+    return rows, next_cursor
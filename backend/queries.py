@@ -0,0 +1,78 @@
+"""
+MongoDB filters and sorts for the owner listings
+Built here rather than inline in the routes so the query-plan test
+(tests/test_query_plans.py) explains exactly what the endpoints send.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# The single portfolio document
+CURRENT_CONTENT = {"type": "current"}
+
+# Keyset orders; the unique id breaks ties
+TIMESTAMP_SORT = ["timestamp", "id"]
+FEEDBACK_SORTS = {
+    "timestamp": TIMESTAMP_SORT,
+    "rating": ["rating", *TIMESTAMP_SORT]
+}
+
+
+def to_naive_utc(moment: datetime) -> datetime:
+    """Normalize query datetimes to the naive UTC values stored in MongoDB"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def date_range_filter(start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
+    bounds = {}
+    if start:
+        bounds["$gte"] = to_naive_utc(start)
+    if end:
+        bounds["$lt"] = to_naive_utc(end)
+    return {"timestamp": bounds} if bounds else {}
+
+
+def keyset_sort(fields: Sequence[str], order: str) -> List[Tuple[str, int]]:
+    direction = 1 if order == "asc" else -1
+    return [(field, direction) for field in fields]
+
+
+def feedback_query(
+    category: Optional[str] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = date_range_filter(start, end)
+    if category:
+        query["category"] = category
+    if min_rating is not None or max_rating is not None:
+        query["rating"] = {
+            op: value for op, value in (("$gte", min_rating), ("$lte", max_rating)) if value is not None
+        }
+    return query
+
+
+def contact_query(
+    status: Optional[str] = None,
+    urgency: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = date_range_filter(start, end)
+    if status:
+        # Contacts stored before status existed count as new
+        query["status"] = {"$in": [status, None]} if status == "new" else status
+    if urgency:
+        query["urgency"] = urgency
+    return query
+
+
+def contact_selector(query: Optional[Dict[str, Any]] = None, ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Bulk selector: a contact_query() filter, an id list, or both; {} selects nothing"""
+    query = query or {}
+    if ids is not None:
+        query = {"$and": [query, {"id": {"$in": ids}}]} if query else {"id": {"$in": ids}}
+    return query
@@ -0,0 +1,207 @@
+"""
+Token-bucket rate limiting for public write endpoints
+Each limited route gets a bucket per client IP plus one shared bucket for the
+route as a whole. Buckets live in memory by default; MongoRateLimitBackend
+shares them across workers through atomic pipeline updates.
+"""
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Bucket of `capacity` tokens refilled evenly over `period` seconds"""
+    capacity: float
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        """Parse specs like '10/minute' or '5/30' (seconds)"""
+        count, _, period = spec.partition("/")
+        period = period.strip() or "second"
+        seconds = PERIODS.get(period)
+        if seconds is None:
+            seconds = float(period)
+        return cls(capacity=float(count), period=float(seconds))
+
+
+@dataclass(frozen=True)
+class RouteLimits:
+    per_ip: Optional[Limit] = None
+    per_route: Optional[Limit] = None
+
+
+class RateLimitBackend(ABC):
+    """Interface for bucket storage; take() must be atomic per key"""
+
+    @abstractmethod
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        """Consume cost tokens; return (allowed, seconds until allowed)"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        # Evicting the least recently seen key only forgets a partially drained
+        # bucket, which errs on the side of letting a client through
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / limit.rate
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """Shared buckets for multi-worker deployments (MongoDB 4.2+)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        refilled = {"$min": [
+            limit.capacity,
+            {"$add": [
+                {"$ifNull": ["$tokens", limit.capacity]},
+                {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, limit.rate]}
+            ]}
+        ]}
+        # Both stages run inside one atomic update; the second sees the refill
+        pipeline = [
+            {"$set": {"tokens": refilled, "updated": now}},
+            {"$set": {
+                "allowed": {"$gte": ["$tokens", cost]},
+                "tokens": {"$cond": [{"$gte": ["$tokens", cost]}, {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "expires_at": datetime.utcnow() + timedelta(seconds=limit.period)
+            }}
+        ]
+        bucket = await self.collection.find_one_and_update(
+            {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return True, 0.0
+        return False, (cost - bucket["tokens"]) / limit.rate
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware, so unlimited routes pay only a dict lookup"""
+
+    def __init__(
+        self,
+        app,
+        rules: Dict[Tuple[str, str], RouteLimits],
+        backend: Optional[RateLimitBackend] = None,
+        trusted_proxy_hops: int = 0,
+        enabled: bool = True
+    ):
+        self.app = app
+        self.rules = rules
+        self.backend = backend or InMemoryRateLimitBackend()
+        # Number of reverse proxies in front of the app, each appending the
+        # address it received the request from to X-Forwarded-For
+        self.trusted_proxy_hops = max(0, trusted_proxy_hops)
+        self.enabled = enabled
+
+    def client_ip(self, scope) -> str:
+        """The address the outermost trusted proxy saw the request come from
+
+        Entries left of that one are client-supplied and can be forged, so
+        they are never used.
+        """
+        if self.trusted_proxy_hops:
+            forwarded = [
+                address.strip()
+                for name, value in scope.get("headers", []) if name == b"x-forwarded-for"
+                for address in value.decode("latin-1").split(",") if address.strip()
+            ]
+            if forwarded:
+                return forwarded[-min(self.trusted_proxy_hops, len(forwarded))]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def check(self, route: str, limits: RouteLimits, ip: str) -> Tuple[bool, float]:
+        try:
+            if limits.per_ip is not None:
+                allowed, retry_after = await self.backend.take(f"{route}|ip:{ip}", limits.per_ip)
+                if not allowed:
+                    return False, retry_after
+            if limits.per_route is not None:
+                return await self.backend.take(f"{route}|route", limits.per_route)
+        except Exception as e:
+            # A broken shared backend must not take the public forms down
+            logger.error(f"Rate limit backend failed, allowing request: {e}")
+        return True, 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            return await self.app(scope, receive, send)
+        path = scope["path"].rstrip("/") or "/"
+        limits = self.rules.get((scope["method"], path))
+        if limits is None:
+            return await self.app(scope, receive, send)
+
+        route = f"{scope['method']} {path}"
+        allowed, retry_after = await self.check(route, limits, self.client_ip(scope))
+        if allowed:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "Too many requests, please try again later"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def load_rules(defaults: Dict[str, Dict[str, str]], override: Optional[str] = None) -> Dict[Tuple[str, str], RouteLimits]:
+    """Build rules from {"POST /api/subscribe": {"ip": "10/minute", "route": "300/minute"}}
+
+    override is a JSON object in the same shape whose entries replace defaults;
+    an entry of null removes the limit for that route.
+    """
+    specs = dict(defaults)
+    if override:
+        specs.update(json.loads(override))
+
+    rules = {}
+    for route, spec in specs.items():
+        if not spec:
+            continue
+        method, _, path = route.partition(" ")
+        rules[(method.upper(), path.rstrip("/") or "/")] = RouteLimits(
+            per_ip=Limit.parse(spec["ip"]) if spec.get("ip") else None,
+            per_route=Limit.parse(spec["route"]) if spec.get("route") else None
+        )
+    return rules
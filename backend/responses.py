@@ -0,0 +1,51 @@
+"""
+Fast JSON responses for the portfolio API
+Serializes with orjson, which handles datetime and UUID natively and produces
+the same ISO 8601 strings as FastAPI's jsonable_encoder. Falls back to the
+stdlib encoder when orjson is not installed.
+"""
+import json
+from typing import Any
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Handle the types orjson doesn't know about (Pydantic models, ObjectId, ...)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content, custom_encoder={ObjectId: str}),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class for the app
+
+    Returning an instance directly from a route also skips FastAPI's
+    jsonable_encoder pass, which dominates the cost of large list payloads.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,172 @@
+"""
+Full-text search over feedback and contact messages
+Uses a weighted MongoDB text index when the server supports one and falls back
+to an in-process BM25 inverted index (local/offline mode, or Mongo-compatible
+stores without $text). Both return rows ranked by relevance.
+"""
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its me my of on or so that the "
+    "this to was we were with you your".split()
+)
+MAX_SEARCH_RESULTS = 100
+# Field weights shared by the text index and the in-process fallback
+SEARCH_WEIGHTS = {"message": 5, "company": 2, "name": 2}
+# "text index required for $text query"
+INDEX_NOT_FOUND = 27
+# auto mode re-probes $text this long after falling back
+TEXT_RETRY_SECONDS = 300.0
+
+
+def tokenize(text: Any) -> List[str]:
+    if not isinstance(text, str):
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class InvertedIndex:
+    """BM25 over weighted fields, keyed by the documents' public id"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, weights: Dict[str, int]):
+        self.weights = weights
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.lengths: Dict[str, float] = {}
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        frequencies: Counter = Counter()
+        for field, weight in self.weights.items():
+            for token in tokenize(doc.get(field)):
+                frequencies[token] += weight
+        doc_id = doc["id"]
+        for token, frequency in frequencies.items():
+            self.postings[token][doc_id] = frequency
+        self.lengths[doc_id] = sum(frequencies.values())
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """All matching ids, best first"""
+        if not self.lengths:
+            return []
+        total = len(self.lengths)
+        average_length = sum(self.lengths.values()) / total or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[doc_id] / average_length)
+                scores[doc_id] += idf * frequency * (self.K1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def text_query(query: str) -> Dict[str, Any]:
+    return {"$text": {"$search": query}}
+
+
+def text_unavailable(error: Exception) -> bool:
+    """Whether $text failed for lack of support rather than a transient fault"""
+    return isinstance(error, NotImplementedError) or (
+        isinstance(error, OperationFailure) and error.code == INDEX_NOT_FOUND
+    )
+
+
+def hydrate_query(ids: List[str]) -> Dict[str, Any]:
+    """Fetch the fallback's ranked ids in one indexed lookup"""
+    return {"id": {"$in": ids}}
+
+
+class TextSearch:
+    def __init__(self, collection, weights: Dict[str, int], backend: str = "auto"):
+        self.collection = collection
+        self.weights = weights
+        # auto serves from the fallback while $text is unavailable and tries
+        # it again every TEXT_RETRY_SECONDS, e.g. once the index is built
+        self.backend = backend
+        self._retry_text_at = 0.0
+        self._index: Optional[InvertedIndex] = None
+        self._signature: Optional[tuple] = None
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return one ranked page of rows and the offset of the next page"""
+        limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+        offset = max(0, offset)
+        rows = None
+        if self.backend == "mongo" or (self.backend == "auto" and time.monotonic() >= self._retry_text_at):
+            try:
+                rows = await self._search_mongo(query, limit + 1, offset, projection)
+            except (OperationFailure, NotImplementedError) as e:
+                if self.backend != "auto" or not text_unavailable(e):
+                    raise
+                logger.error(f"$text search on {self.collection.name} unavailable, using in-process search: {e}")
+                self._retry_text_at = time.monotonic() + TEXT_RETRY_SECONDS
+        if rows is None:
+            rows = await self._search_python(query, limit + 1, offset, projection)
+        next_offset = offset + limit if len(rows) > limit else None
+        return rows[:limit], next_offset
+
+    async def _search_mongo(self, query, limit, offset, projection):
+        score = {"$meta": "textScore"}
+        cursor = self.collection.find(
+            text_query(query),
+            {**(projection or {"_id": 0}), "score": score}
+        ).sort([("score", score)]).skip(offset).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def _refresh_index(self) -> InvertedIndex:
+        # Rebuild when rows were added or removed since the last build
+        newest = await self.collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        signature = (await self.collection.count_documents({}), newest and newest["_id"])
+        if self._index is None or signature != self._signature:
+            index = InvertedIndex(self.weights)
+            fields = {"_id": 0, "id": 1, **{field: 1 for field in self.weights}}
+            async for doc in self.collection.find({}, fields):
+                index.add(doc)
+            self._index, self._signature = index, signature
+        return self._index
+
+    async def _search_python(self, query, limit, offset, projection):
+        index = await self._refresh_index()
+        ranked = index.search(query)[offset:offset + limit]
+        if not ranked:
+            return []
+        ids = [doc_id for doc_id, _ in ranked]
+        found = {
+            doc["id"]: doc
+            for doc in await self.collection.find(
+                hydrate_query(ids), {**(projection or {"_id": 0}), "id": 1}
+            ).to_list(len(ids))
+        }
+        # id is only fetched to match rows to the ranking; return it only when
+        # asked for so rows have the same shape as the $text path
+        drop_id = bool(projection) and not projection.get("id") and any(
+            value for field, value in projection.items() if field != "_id"
+        )
+        rows = []
+        for doc_id, score in ranked:
+            if doc_id in found:
+                row = {**found[doc_id], "score": round(score, 4)}
+                if drop_id:
+                    del row["id"]
+                rows.append(row)
+        return rows
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Query, File, UploadFile
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -6,23 +6,118 @@ from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import List, Dict, Any, Optional, Union
 import uuid
 from datetime import datetime, timedelta
 import jwt
 import json
+import asyncio
+from contextlib import asynccontextmanager
 
 ROOT_DIR = Path(__file__).parent
+# Loaded before the local modules: content_cache and auth_cache size
+# themselves from the environment at import time
 load_dotenv(ROOT_DIR / '.env')
 
+from content_cache import content_cache
+from responses import FastJSONResponse, dumps
+from auth_cache import verified_tokens
+from rate_limit import InMemoryRateLimitBackend, MongoRateLimitBackend, RateLimitMiddleware, load_rules
+from snapshots import ResponseSnapshot
+from pagination import InvalidCursor, fetch_page, projection_for
+from queries import (
+    CURRENT_CONTENT, FEEDBACK_SORTS, TIMESTAMP_SORT, contact_query, contact_selector, date_range_filter,
+    feedback_query, keyset_sort, to_naive_utc
+)
+from status_rollups import GRANULARITIES, StatusRollupJob
+from content_patch import JsonPatchError, apply_patch, build_update, parse_pointer, sections_to_operations
+from content_revisions import ContentRevisionStore
+from subscriber_import import detect_format, import_subscribers
+from subscriber_emails import merge_legacy_emails, normalize_email
+from exports import export_response
+from bloom import SubscriberFilter
+from write_behind import WriteBehindQueue
+from search import SEARCH_WEIGHTS, TextSearch
+from indexes import apply_indexes, registry_from_env, status_retention_registry
+from analytics_report import build_report
+from analytics import TIMESERIES_GRANULARITIES, TIMESERIES_METRICS, AnalyticsCounters, compute_analytics
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Heartbeat rollups and raw-row retention
+STATUS_RETENTION_DAYS = int(os.environ.get('STATUS_RETENTION_DAYS', '30'))
+STATUS_ROLLUP_INTERVAL = float(os.environ.get('STATUS_ROLLUP_INTERVAL', '60'))
+status_rollup_job = StatusRollupJob(
+    db.status_checks,
+    db.status_rollups,
+    db.job_state,
+    lag_seconds=int(os.environ.get('STATUS_ROLLUP_LAG', '60')),
+    minute_retention_days=int(os.environ.get('STATUS_MINUTE_ROLLUP_RETENTION_DAYS', '90'))
+)
+
+# Dashboard counters maintained with $inc and periodically rebuilt from source
+ANALYTICS_RECONCILE_INTERVAL = float(os.environ.get('ANALYTICS_RECONCILE_INTERVAL', '3600'))
+ANALYTICS_ROLLUP_INTERVAL = float(os.environ.get('ANALYTICS_ROLLUP_INTERVAL', '300'))
+MAX_TIMESERIES_DAYS = 3 * 366
+analytics_counters = AnalyticsCounters(db.analytics_counters, db)
+
+# Ranked full-text search over inbound messages (SEARCH_BACKEND=auto|mongo|python)
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+feedback_search = TextSearch(db.feedback, SEARCH_WEIGHTS, backend=SEARCH_BACKEND)
+contact_search = TextSearch(db.contacts, SEARCH_WEIGHTS, backend=SEARCH_BACKEND)
+
+# In-memory Bloom filter in front of subscribe's existence check
+subscriber_filter = SubscriberFilter(
+    capacity=int(os.environ.get('SUBSCRIBER_BLOOM_CAPACITY', '100000')),
+    fp_rate=float(os.environ.get('SUBSCRIBER_BLOOM_FP_RATE', '0.01')),
+    enabled=os.environ.get('SUBSCRIBER_BLOOM_ENABLED', 'true').lower() == 'true'
+)
+
+# Delta-compressed revision history of the content document
+revision_store = ContentRevisionStore(
+    db.content_revisions,
+    db.counters,
+    snapshot_interval=int(os.environ.get('CONTENT_SNAPSHOT_INTERVAL', '20'))
+)
+
+# Optional write-behind ingestion for feedback and contact submissions
+WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+WRITE_BEHIND_JOURNAL_DIR = os.environ.get('WRITE_BEHIND_JOURNAL_DIR')
+
+def make_write_behind_queue(collection) -> Optional[WriteBehindQueue]:
+    if not WRITE_BEHIND_ENABLED:
+        return None
+    return WriteBehindQueue(
+        collection,
+        max_size=int(os.environ.get('WRITE_BEHIND_MAX_QUEUE', '10000')),
+        batch_size=int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '500')),
+        flush_interval=float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', '0.5')),
+        journal_path=str(Path(WRITE_BEHIND_JOURNAL_DIR) / f"{collection.name}.journal") if WRITE_BEHIND_JOURNAL_DIR else None
+    )
+
+feedback_queue = make_write_behind_queue(db.feedback)
+contact_queue = make_write_behind_queue(db.contacts)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The hook tuples are defined at the bottom of this module, after the
+    # objects they start and stop
+    for hook in STARTUP_HOOKS:
+        await hook()
+    try:
+        yield
+    finally:
+        for hook in SHUTDOWN_HOOKS:
+            await hook()
+
+# Create the main app without a prefix; every router serializes with orjson
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -60,6 +155,17 @@ class PortfolioContent(BaseModel):
     education: Dict[str, Any]
     contact: Dict[str, Any]
 
+# Per-section validators used by partial content updates
+CONTENT_SECTION_ADAPTERS = {
+    name: TypeAdapter(field.annotation) for name, field in PortfolioContent.model_fields.items()
+}
+
+class JsonPatchOperation(BaseModel):
+    op: str
+    path: str
+    value: Any = None
+    from_: Optional[str] = Field(default=None, alias="from")
+
 class SubscribeRequest(BaseModel):
     email: str
 
@@ -85,6 +191,23 @@ class ContactRequest(BaseModel):
     preferredContact: str = 'email'
     urgency: str = 'normal'
 
+CONTACT_STATUSES = ("new", "contacted", "qualified", "won", "lost", "archived")
+MAX_BULK_IDS = 10000
+
+class ContactFilter(BaseModel):
+    status: Optional[str] = None
+    urgency: Optional[str] = None
+    from_: Optional[datetime] = Field(default=None, alias="from")
+    to: Optional[datetime] = None
+
+class ContactBulkRequest(BaseModel):
+    """Select contacts by explicit ids or by filter (at least one is required)"""
+    ids: Optional[List[str]] = Field(default=None, max_length=MAX_BULK_IDS)
+    filter: Optional[ContactFilter] = None
+
+class ContactBulkStatusRequest(ContactBulkRequest):
+    status: str
+
 class Subscriber(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     email: str
@@ -121,21 +244,33 @@ class Contact(BaseModel):
     ip_address: Optional[str] = None
     status: str = Field(default="new")
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        if payload.get("role") != "owner":
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Shared owner auth dependency
+
+    Claims of already-verified tokens come from an LRU keyed by token digest
+    and expiring with exp. Being async, it also avoids a threadpool hop.
+    """
+    token = credentials.credentials
+    payload = verified_tokens.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Token expired")
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        verified_tokens.put(token, payload)
+    if payload.get("role") != "owner":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return payload
 
 # Basic routes
+# The root payload never changes, so it is encoded (and compressed) once
+ROOT_SNAPSHOT = ResponseSnapshot(dumps({"message": "Abhishek Kolluri Portfolio API", "version": "1.0.0"}))
+
 @api_router.get("/")
-async def root():
-    return {"message": "Abhishek Kolluri Portfolio API", "version": "1.0.0"}
+async def root(request: Request):
+    return ROOT_SNAPSHOT.to_response(request, cache_control="public, max-age=300")
 
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
@@ -144,10 +279,174 @@ async def create_status_check(input: StatusCheckCreate):
     _ = await db.status_checks.insert_one(status_obj.dict())
     return status_obj
 
+STATUS_BATCH_MAX = int(os.environ.get('STATUS_BATCH_MAX', '5000'))
+
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """Split a JSON array or NDJSON body into items
+
+    NDJSON lines that fail to parse are kept as ValueError instances so they
+    can be reported per item instead of rejecting the whole batch.
+    """
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(e)
+        return items
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Body must be a JSON array")
+    return items
+
+@api_router.post("/status/batch")
+async def create_status_checks_batch(request: Request):
+    """Ingest many status checks in one request
+
+    Accepts a JSON array or NDJSON (application/x-ndjson) body. Valid items are
+    written with a single unordered insert_many; invalid ones are reported by
+    their position in the batch.
+    """
+    try:
+        items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+    if len(items) > STATUS_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {STATUS_BATCH_MAX} items")
+    
+    documents, positions, errors = [], [], []
+    for index, item in enumerate(items):
+        if isinstance(item, ValueError):
+            errors.append({"index": index, "error": f"Invalid JSON: {item}"})
+            continue
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Item must be an object"})
+            continue
+        try:
+            status_obj = StatusCheck(**StatusCheckCreate(**item).dict())
+        except ValidationError as e:
+            errors.append({"index": index, "error": e.errors(include_url=False, include_input=False)})
+            continue
+        documents.append(status_obj.dict())
+        positions.append(index)
+    
+    inserted = 0
+    if documents:
+        try:
+            result = await db.status_checks.insert_many(documents, ordered=False)
+            inserted = len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Unordered writes keep going past failures; map each back to its item
+            inserted = e.details.get("nInserted", 0)
+            failed = set()
+            for write_error in e.details.get("writeErrors", []):
+                failed.add(write_error["index"])
+                errors.append({"index": positions[write_error["index"]], "error": write_error.get("errmsg")})
+            documents = [doc for i, doc in enumerate(documents) if i not in failed]
+        except Exception as e:
+            logging.error(f"Error ingesting status batch: {e}")
+            raise HTTPException(status_code=500, detail="Failed to ingest status checks")
+    
+    return {
+        "received": len(items),
+        "inserted": inserted,
+        "ids": [doc["id"] for doc in documents],
+        "errors": sorted(errors, key=lambda error: error["index"])
+    }
+
+STATUS_CHECK_PROJECTION = {"_id": 0, "id": 1, "client_name": 1, "timestamp": 1}
+
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def get_status_checks(limit: int = 100, cursor: Optional[str] = None, order: str = "asc"):
+    """List status checks, one keyset page at a time
+
+    Pages are ordered by (timestamp, id); when more rows exist the opaque
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    try:
+        status_checks, next_cursor = await fetch_page(
+            db.status_checks,
+            {},
+            keyset_sort(TIMESTAMP_SORT, order),
+            limit,
+            cursor=cursor,
+            projection=STATUS_CHECK_PROJECTION
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    # Rows are already in StatusCheck shape thanks to the projection
+    return FastJSONResponse(status_checks, headers=headers)
+
+STATUS_SUMMARY_LIMIT = 2000
+
+@api_router.get("/status/summary")
+async def get_status_summary(
+    granularity: str = "hour",
+    client_name: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to")
+):
+    """Heartbeat counts per client per minute/hour bucket, read from rollups
+
+    Defaults to the last 24 hours for hourly buckets and the last 2 hours for
+    minute buckets. Buckets newer than the rollup lag are not included yet.
+    Past STATUS_SUMMARY_LIMIT buckets the range is cut at the last whole
+    bucket_start: "to" moves back to where the next page starts and
+    "truncated" is set.
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be 'minute' or 'hour'")
+    end = to_naive_utc(end) if end else datetime.utcnow()
+    default_span = timedelta(hours=24) if granularity == "hour" else timedelta(hours=2)
+    start = to_naive_utc(start) if start else end - default_span
+    try:
+        buckets = await status_rollup_job.summary(
+            granularity, start, end, client_name=client_name, limit=STATUS_SUMMARY_LIMIT + 1
+        )
+        truncated = len(buckets) > STATUS_SUMMARY_LIMIT
+        if truncated:
+            # Drop the partly read bucket_start so every client total is exact
+            end = buckets[STATUS_SUMMARY_LIMIT]["bucket_start"]
+            buckets = [bucket for bucket in buckets if bucket["bucket_start"] < end]
+            if not buckets:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"More than {STATUS_SUMMARY_LIMIT} clients per bucket; filter by client_name"
+                )
+        clients: Dict[str, Dict[str, Any]] = {}
+        for bucket in buckets:
+            totals = clients.setdefault(bucket["client_name"], {"count": 0, "last_seen": None})
+            totals["count"] += bucket["count"]
+            totals["last_seen"] = max(filter(None, [totals["last_seen"], bucket["last_seen"]]))
+        return {
+            "granularity": granularity,
+            "from": start,
+            "to": end,
+            "clients": clients,
+            "buckets": buckets,
+            "truncated": truncated
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error fetching status summary: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch status summary")
+
+@api_router.post("/status/rollup")
+async def run_status_rollup(user: dict = Depends(verify_token)):
+    """Run the status rollup job now (authenticated endpoint)"""
+    try:
+        return await status_rollup_job.run_once()
+    except Exception as e:
+        logging.error(f"Error running status rollup: {e}")
+        raise HTTPException(status_code=500, detail="Failed to run status rollup")
 
 # Authentication
 @api_router.post("/login", response_model=LoginResponse)
@@ -171,22 +470,180 @@ async def login(request: LoginRequest):
 
 # Portfolio content management
 @api_router.get("/content")
-async def get_content():
-    """Get portfolio content (public endpoint)"""
-    try:
-        content_doc = await db.portfolio_content.find_one({"type": "current"})
-        if content_doc:
-            # Remove MongoDB _id field
-            content_doc.pop('_id', None)
-            content_doc.pop('type', None)
-            return content_doc
-        else:
-            # Return default content if none exists
-            return {"message": "No content found, using defaults"}
+async def get_content(request: Request):
+    """Get portfolio content (public endpoint, cached with ETag revalidation)"""
+    try:
+        snapshot = await content_cache.get(load_current_content)
+        return snapshot.to_response(request)
     except Exception as e:
         logging.error(f"Error fetching content: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch content")
 
+# Literal /content/... paths are declared before /content/{section} so they
+# are matched first
+@api_router.get("/content/changes")
+async def get_content_changes(since: int = 0):
+    """Get only the sections changed after a content revision (public endpoint)
+
+    Clients holding content at revision N call this with since=N and merge the
+    returned sections instead of downloading the whole document again.
+    """
+    try:
+        content_doc = await content_cache.get_payload(load_current_content)
+        revision = content_doc.get("revision", 0)
+        # A client ahead of the server (e.g. after a database reset) must resync
+        reset = since > revision or "revision" not in content_doc
+        section_revisions = content_doc.get("section_revisions") or {}
+        changed = {
+            name: content_doc[name]
+            for name in CONTENT_SECTION_ADAPTERS
+            if name in content_doc and (reset or section_revisions.get(name, revision) > since)
+        }
+        return {
+            "revision": revision,
+            "since": since,
+            "reset": reset,
+            "updated_at": content_doc.get("updated_at"),
+            "changed": changed
+        }
+    except Exception as e:
+        logging.error(f"Error fetching content changes: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch content changes")
+
+# Content revision history
+@api_router.get("/content/revisions")
+async def list_content_revisions(
+    limit: int = 50,
+    before: Optional[int] = None,
+    user: dict = Depends(verify_token)
+):
+    """List content revisions, newest first (authenticated endpoint)"""
+    try:
+        revisions = await revision_store.list_revisions(limit=max(1, min(limit, 200)), before=before)
+        return {
+            "current": await revision_store.current_revision(),
+            "count": len(revisions),
+            "revisions": revisions
+        }
+    except Exception as e:
+        logging.error(f"Error listing revisions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list revisions")
+
+@api_router.get("/content/revisions/{revision}")
+async def get_content_revision(revision: int, user: dict = Depends(verify_token)):
+    """Rebuild content as of a revision without restoring it (authenticated endpoint)"""
+    try:
+        sections = await revision_store.rebuild(revision)
+        return {"revision": revision, "content": sections}
+    except LookupError:
+        raise HTTPException(status_code=404, detail=f"Revision {revision} not found")
+    except Exception as e:
+        logging.error(f"Error rebuilding revision {revision}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to load revision")
+
+@api_router.post("/content/revisions/{revision}/restore")
+async def restore_content_revision(revision: int, user: dict = Depends(verify_token)):
+    """Restore content to a previous revision (authenticated endpoint)
+
+    The restore is recorded as a new revision, so history stays append-only.
+    """
+    try:
+        sections = await revision_store.rebuild(revision)
+        content = PortfolioContent(**sections)
+        new_revision = await store_content(content.dict(), restored_from=revision)
+        return {
+            "message": f"Content restored from revision {revision}",
+            "revision": new_revision,
+            "timestamp": datetime.utcnow()
+        }
+    except LookupError:
+        raise HTTPException(status_code=404, detail=f"Revision {revision} not found")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except Exception as e:
+        logging.error(f"Error restoring revision {revision}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to restore revision")
+
+@api_router.get("/content/{section}")
+async def get_content_section(section: str, request: Request):
+    """Get a single portfolio content section (public endpoint)
+
+    Lets the frontend render the hero first and lazy-load heavier sections;
+    each section carries its own ETag so unchanged sections revalidate to 304.
+    """
+    if section not in CONTENT_SECTION_ADAPTERS:
+        raise HTTPException(status_code=404, detail=f"Unknown content section: {section}")
+    try:
+        snapshot = await content_cache.get_section(section, load_content_section)
+        return snapshot.to_response(request)
+    except LookupError:
+        raise HTTPException(status_code=404, detail=f"Content section not found: {section}")
+    except Exception as e:
+        logging.error(f"Error fetching content section {section}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch content")
+
+async def load_current_content() -> Dict[str, Any]:
+    """Read the current content document from MongoDB"""
+    content_doc = await db.portfolio_content.find_one(CURRENT_CONTENT)
+    if content_doc:
+        # Remove MongoDB _id field
+        content_doc.pop('_id', None)
+        content_doc.pop('type', None)
+        return content_doc
+    # Return default content if none exists
+    return {"message": "No content found, using defaults"}
+
+async def load_content_section(section: str) -> Any:
+    """Read one section of the current content document via a projection"""
+    content_doc = await db.portfolio_content.find_one(CURRENT_CONTENT, {"_id": 0, section: 1})
+    if not content_doc or section not in content_doc:
+        raise LookupError(section)
+    return content_doc[section]
+
+def content_timestamp() -> datetime:
+    """Current UTC time at the millisecond precision MongoDB stores"""
+    # Truncating keeps the cached copy byte-identical to a later database reload
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+async def store_content(content_dict: Dict[str, Any], restored_from: Optional[int] = None) -> Optional[int]:
+    """Replace the current content document and record it as a new revision"""
+    previous = await db.portfolio_content.find_one(CURRENT_CONTENT, {"_id": 0})
+    changed = {
+        name: content_dict[name]
+        for name in CONTENT_SECTION_ADAPTERS
+        if previous is None or previous.get(name) != content_dict[name]
+    }
+    if previous is not None and not changed:
+        # Autosave of identical content: nothing to write or record
+        return previous.get("revision")
+    
+    revision = await revision_store.next_revision()
+    # Per-section revision numbers let clients fetch only what changed
+    section_revisions = dict((previous or {}).get("section_revisions") or {})
+    section_revisions.update({name: revision for name in changed})
+    content_doc = {
+        **content_dict,
+        **CURRENT_CONTENT,
+        "revision": revision,
+        "section_revisions": section_revisions,
+        "updated_at": content_timestamp(),
+        "updated_by": "owner"
+    }
+    
+    # Upsert the content document
+    await db.portfolio_content.replace_one(
+        CURRENT_CONTENT,
+        content_doc,
+        upsert=True
+    )
+    await revision_store.record(revision, changed, content_doc, CONTENT_SECTION_ADAPTERS, restored_from=restored_from)
+    
+    # Write-through: the next GET /api/content is served from memory
+    content_doc.pop("type", None)
+    await content_cache.set(content_doc)
+    return revision
+
 @api_router.post("/save-content")
 async def save_content(
     content: PortfolioContent,
@@ -194,37 +651,149 @@ async def save_content(
 ):
     """Save portfolio content (authenticated endpoint)"""
     try:
-        content_dict = content.dict()
-        content_dict["type"] = "current"
-        content_dict["updated_at"] = datetime.utcnow()
-        content_dict["updated_by"] = "owner"
-        
-        # Upsert the content document
-        await db.portfolio_content.replace_one(
-            {"type": "current"},
-            content_dict,
-            upsert=True
-        )
+        revision = await store_content(content.dict())
         
-        return {"message": "Content saved successfully", "timestamp": datetime.utcnow()}
+        return {"message": "Content saved successfully", "revision": revision, "timestamp": datetime.utcnow()}
     except Exception as e:
         logging.error(f"Error saving content: {e}")
         raise HTTPException(status_code=500, detail="Failed to save content")
 
+@api_router.patch("/save-content")
+async def patch_content(
+    patch: Union[List[JsonPatchOperation], Dict[str, Any]],
+    user: dict = Depends(verify_token)
+):
+    """Partially update portfolio content (authenticated endpoint)
+
+    Accepts RFC 6902 JSON Patch operations or a {section: value} map and writes
+    only the changed paths with $set/$unset instead of replacing the document.
+    """
+    try:
+        if isinstance(patch, dict):
+            operations = sections_to_operations(patch)
+        else:
+            operations = [op.dict(by_alias=True, exclude_unset=True) for op in patch]
+        if not operations:
+            raise HTTPException(status_code=400, detail="Patch contains no operations")
+        
+        # Only load the sections the patch actually touches
+        sections = set()
+        for operation in operations:
+            for pointer in (operation.get("path"), operation.get("from")):
+                if pointer is None:
+                    continue
+                tokens = parse_pointer(pointer)
+                if not tokens or tokens[0] not in CONTENT_SECTION_ADAPTERS:
+                    raise HTTPException(status_code=422, detail=f"Unknown content section in path: {pointer}")
+                sections.add(tokens[0])
+        
+        projection = {"_id": 0, "revision": 1, **{section: 1 for section in sections}}
+        current = await db.portfolio_content.find_one(CURRENT_CONTENT, projection)
+        if current is None:
+            raise HTTPException(status_code=404, detail="No saved content to update")
+        current_revision = current.pop("revision", None)
+        # Compare-and-set on the revision read above: a concurrent write makes
+        # this patch (and its "test" operations) stale, so it is refused
+        guard = {
+            **CURRENT_CONTENT,
+            "revision": {"$exists": False} if current_revision is None else current_revision
+        }
+        
+        touched = apply_patch(current, operations)
+        if not touched:
+            # Only "test" operations: they passed, and nothing is written
+            return {
+                "message": "Content unchanged",
+                "revision": current_revision or 0,
+                "updated": [],
+                "timestamp": datetime.utcnow()
+            }
+        for section in {path[0] for path in touched}:
+            if section not in current:
+                raise HTTPException(status_code=422, detail=f"Section '{section}' cannot be removed")
+            CONTENT_SECTION_ADAPTERS[section].validate_python(current[section])
+        
+        stale = HTTPException(status_code=409, detail="Content changed since it was read; reload and retry")
+        # Checked again just before allocating, so a patch that already lost
+        # the race does not use up a revision number
+        if not await db.portfolio_content.find_one(guard, {"_id": 1}):
+            raise stale
+        revision = await revision_store.next_revision()
+        update = build_update(current, touched)
+        update.setdefault("$set", {}).update({
+            **{f"section_revisions.{section}": revision for section in {path[0] for path in touched}},
+            "revision": revision,
+            "updated_at": content_timestamp(),
+            "updated_by": "owner"
+        })
+        updated_doc = await db.portfolio_content.find_one_and_update(
+            guard,
+            update,
+            projection={"_id": 0, "type": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated_doc is None:
+            # Lost the race between the check and the write; the allocated
+            # number is left unused and history stays consistent
+            raise stale
+        
+        changed_sections = {path[0] for path in touched}
+        await revision_store.record(
+            revision,
+            {section: updated_doc[section] for section in changed_sections},
+            updated_doc,
+            CONTENT_SECTION_ADAPTERS
+        )
+        
+        # Write-through with the document MongoDB returned after the update
+        await content_cache.set(updated_doc)
+        
+        return {
+            "message": "Content updated successfully",
+            "revision": revision,
+            "updated": sorted("/" + "/".join(path) for path in touched),
+            "timestamp": datetime.utcnow()
+        }
+    except HTTPException:
+        raise
+    except JsonPatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except Exception as e:
+        logging.error(f"Error patching content: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update content")
+
 # Subscriber management
 @api_router.post("/subscribe")
 async def subscribe(request: SubscribeRequest):
     """Subscribe to newsletter (public endpoint with rate limiting)"""
     try:
-        # Check if email already exists
-        existing = await db.subscribers.find_one({"email": request.email})
-        if existing:
-            return {"message": "Already subscribed!", "status": "existing"}
-        
-        # Create new subscriber
-        subscriber = Subscriber(email=request.email)
-        await db.subscribers.insert_one(subscriber.dict())
+        subscriber = Subscriber(email=normalize_email(request.email))
+        try:
+            if not subscriber_filter.might_contain(subscriber.email):
+                # Definitely unseen here: a plain insert skips the upsert's
+                # lookup, and the unique index still catches other workers
+                await db.subscribers.insert_one(subscriber.dict())
+                is_new = True
+            else:
+                # One round-trip: insert only if the email is not there yet; the
+                # unique index makes concurrent submits converge on a single document
+                result = await db.subscribers.update_one(
+                    {"email": subscriber.email},
+                    {"$setOnInsert": subscriber.dict()},
+                    upsert=True
+                )
+                is_new = result.upserted_id is not None
+        except DuplicateKeyError:
+            # Lost a race against an identical submit
+            is_new = False
+        subscriber_filter.add(subscriber.email)
+        if is_new:
+            analytics_counters.track("subscribers", subscriber.subscribed_at)
         
+        if not is_new:
+            return {"message": "Already subscribed!", "status": "existing"}
         return {"message": "You're on my radar! 🎯", "status": "new"}
     except Exception as e:
         logging.error(f"Error subscribing: {e}")
@@ -235,14 +804,59 @@ async def get_subscribers(user: dict = Depends(verify_token)):
     """Get all subscribers (authenticated endpoint)"""
     try:
         subscribers = await db.subscribers.find().to_list(1000)
-        return {
+        # Returning the response directly skips FastAPI's jsonable_encoder pass
+        return FastJSONResponse({
             "count": len(subscribers),
             "subscribers": [{"email": s["email"], "subscribed_at": s["subscribed_at"]} for s in subscribers]
-        }
+        })
     except Exception as e:
         logging.error(f"Error fetching subscribers: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch subscribers")
 
+SUBSCRIBER_IMPORT_BATCH_SIZE = int(os.environ.get('SUBSCRIBER_IMPORT_BATCH_SIZE', '1000'))
+
+def remember_imported(docs: List[Dict[str, Any]]) -> None:
+    """Add a written import batch to the subscriber Bloom filter"""
+    for doc in docs:
+        subscriber_filter.add(doc["email"])
+
+@api_router.post("/subscribers/import")
+async def import_subscriber_list(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    user: dict = Depends(verify_token)
+):
+    """Bulk import subscribers from a CSV or NDJSON upload (authenticated endpoint)"""
+    try:
+        fmt = format or detect_format(file.filename, file.content_type)
+        stats = await import_subscribers(
+            db.subscribers,
+            file.file,
+            fmt,
+            build_document=lambda email: Subscriber(email=email).dict(),
+            normalize=normalize_email,
+            batch_size=SUBSCRIBER_IMPORT_BATCH_SIZE,
+            on_batch=remember_imported
+        )
+        if stats["new"]:
+            analytics_counters.track("subscribers", datetime.utcnow(), count=stats["new"])
+        return {"format": fmt, **stats}
+    except Exception as e:
+        logging.error(f"Error importing subscribers: {e}")
+        raise HTTPException(status_code=500, detail="Subscriber import failed")
+    finally:
+        await file.close()
+
+SUBSCRIBER_EXPORT_FIELDS = ["id", "email", "subscribed_at"]
+
+@api_router.get("/subscribers/export")
+async def export_subscribers(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    user: dict = Depends(verify_token)
+):
+    """Stream all subscribers as CSV or NDJSON (authenticated endpoint)"""
+    return export_response(db.subscribers, SUBSCRIBER_EXPORT_FIELDS, format, "subscribers")
+
 # GitHub integration (future implementation)
 @api_router.get("/github-repos")
 async def get_github_repos():
@@ -256,114 +870,308 @@ async def create_feedback(request: FeedbackRequest):
     """Submit feedback (public endpoint with rate limiting)"""
     try:
         feedback = Feedback(**request.dict())
-        await db.feedback.insert_one(feedback.dict())
+        # A full queue falls back to an inline write rather than dropping
+        if feedback_queue is None or not feedback_queue.offer(feedback.dict()):
+            await db.feedback.insert_one(feedback.dict())
+        analytics_counters.track("feedback", feedback.timestamp, rating=feedback.rating)
         
         return {"message": "Feedback received! Thank you.", "status": "success", "id": feedback.id}
     except Exception as e:
         logging.error(f"Error saving feedback: {e}")
         raise HTTPException(status_code=500, detail="Failed to save feedback")
 
+FEEDBACK_FIELDS = [
+    "id", "name", "email", "company", "category", "rating",
+    "message", "wouldRecommend", "contactBack", "timestamp"
+]
 @api_router.get("/feedback")
-async def get_feedback(user: dict = Depends(verify_token)):
-    """Get all feedback (authenticated endpoint)"""
+async def get_feedback(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = Query("timestamp", pattern="^(timestamp|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[int] = Query(None, ge=1, le=5),
+    max_rating: Optional[int] = Query(None, ge=1, le=5),
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    user: dict = Depends(verify_token)
+):
+    """List feedback one keyset page at a time (authenticated endpoint)
+
+    Filters, sort and the fields= projection all run in MongoDB; pass the
+    returned next_cursor back with the same parameters for the next page.
+    """
     try:
-        feedback_list = await db.feedback.find().to_list(1000)
-        return {
+        projection = projection_for(fields, FEEDBACK_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        feedback_list, next_cursor = await fetch_page(
+            db.feedback,
+            feedback_query(category, min_rating, max_rating, start, end),
+            keyset_sort(FEEDBACK_SORTS[sort], order),
+            limit,
+            cursor=cursor,
+            projection=projection
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        # Rows come back already projected; no per-field remapping
+        return FastJSONResponse({
             "count": len(feedback_list),
-            "feedback": [
-                {
-                    "id": f["id"],
-                    "name": f["name"],
-                    "email": f["email"],
-                    "company": f.get("company"),
-                    "category": f["category"],
-                    "rating": f["rating"],
-                    "message": f["message"],
-                    "wouldRecommend": f["wouldRecommend"],
-                    "contactBack": f["contactBack"],
-                    "timestamp": f["timestamp"]
-                } for f in feedback_list
-            ]
-        }
+            "next_cursor": next_cursor,
+            "feedback": feedback_list
+        }, headers=headers)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error fetching feedback: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch feedback")
 
+@api_router.get("/feedback/export")
+async def export_feedback(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    user: dict = Depends(verify_token)
+):
+    """Stream all feedback as CSV or NDJSON (authenticated endpoint)"""
+    return export_response(db.feedback, FEEDBACK_FIELDS, format, "feedback")
+
+@api_router.get("/feedback/search")
+async def search_feedback(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = 20,
+    offset: int = 0,
+    fields: Optional[str] = None,
+    user: dict = Depends(verify_token)
+):
+    """Search feedback name, company and message, best matches first (authenticated endpoint)"""
+    try:
+        projection = projection_for(fields, FEEDBACK_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        results, next_offset = await feedback_search.search(q, limit, offset, projection)
+        return FastJSONResponse({"count": len(results), "next_offset": next_offset, "feedback": results})
+    except Exception as e:
+        logging.error(f"Error searching feedback: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search feedback")
+
 # Contact management
 @api_router.post("/contact")
 async def create_contact(request: ContactRequest):
     """Submit contact form (public endpoint with rate limiting)"""
     try:
         contact = Contact(**request.dict())
-        await db.contacts.insert_one(contact.dict())
+        if contact_queue is None or not contact_queue.offer(contact.dict()):
+            await db.contacts.insert_one(contact.dict())
+        analytics_counters.track("contacts", contact.timestamp)
         
         return {"message": "Message sent successfully! I'll get back to you soon.", "status": "success", "id": contact.id}
     except Exception as e:
         logging.error(f"Error saving contact: {e}")
         raise HTTPException(status_code=500, detail="Failed to save contact")
 
+CONTACT_FIELDS = [
+    "id", "name", "email", "company", "phone", "projectType", "budget", "timeline",
+    "message", "preferredContact", "urgency", "status", "timestamp"
+]
+
+def bulk_contact_selector(request: ContactBulkRequest) -> Dict[str, Any]:
+    """Mongo filter for a bulk request; refuses to match the whole inbox implicitly"""
+    f = request.filter
+    query = contact_selector(contact_query(f.status, f.urgency, f.from_, f.to) if f else None, request.ids)
+    if not query:
+        raise HTTPException(status_code=400, detail="Provide ids or a non-empty filter")
+    return query
+
 @api_router.get("/contacts")
-async def get_contacts(user: dict = Depends(verify_token)):
-    """Get all contacts (authenticated endpoint)"""
+async def get_contacts(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    urgency: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    user: dict = Depends(verify_token)
+):
+    """List contacts newest first, one keyset page at a time (authenticated endpoint)"""
     try:
-        contacts_list = await db.contacts.find().to_list(1000)
-        return {
+        projection = projection_for(fields, CONTACT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        contacts_list, next_cursor = await fetch_page(
+            db.contacts,
+            contact_query(status, urgency, start, end),
+            keyset_sort(TIMESTAMP_SORT, order),
+            limit,
+            cursor=cursor,
+            projection=projection
+        )
+        if "status" in projection:
+            for c in contacts_list:
+                c.setdefault("status", "new")
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return FastJSONResponse({
             "count": len(contacts_list),
-            "contacts": [
-                {
-                    "id": c["id"],
-                    "name": c["name"],
-                    "email": c["email"],
-                    "company": c.get("company"),
-                    "phone": c.get("phone"),
-                    "projectType": c["projectType"],
-                    "budget": c["budget"],
-                    "timeline": c["timeline"],
-                    "message": c["message"],
-                    "preferredContact": c["preferredContact"],
-                    "urgency": c["urgency"],
-                    "status": c.get("status", "new"),
-                    "timestamp": c["timestamp"]
-                } for c in contacts_list
-            ]
-        }
+            "next_cursor": next_cursor,
+            "contacts": contacts_list
+        }, headers=headers)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error fetching contacts: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch contacts")
 
+@api_router.get("/contacts/export")
+async def export_contacts(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    user: dict = Depends(verify_token)
+):
+    """Stream all contacts as CSV or NDJSON (authenticated endpoint)"""
+    return export_response(
+        db.contacts, CONTACT_FIELDS, format, "contacts", defaults={"status": "new"}
+    )
+
+def status_update(status: str, stamp_field: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Pipeline update that only touches contacts whose status actually changes,
+    so modified counts what triage changed and timestamps are not bumped"""
+    now = datetime.utcnow()
+    unchanged = {"$eq": ["$status", status]}
+    stamps = {"status_updated_at": {"$cond": [unchanged, "$status_updated_at", now]}}
+    if stamp_field:
+        stamps[stamp_field] = {"$cond": [unchanged, f"${stamp_field}", now]}
+    return [{"$set": {"status": status, **stamps}}]
+
+@api_router.post("/contacts/bulk/status")
+async def bulk_set_contact_status(request: ContactBulkStatusRequest, user: dict = Depends(verify_token)):
+    """Set the status of many contacts in one update_many (authenticated endpoint)"""
+    if request.status not in CONTACT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of: {', '.join(CONTACT_STATUSES)}")
+    query = bulk_contact_selector(request)
+    try:
+        result = await db.contacts.update_many(query, status_update(request.status))
+        return {"matched": result.matched_count, "modified": result.modified_count}
+    except Exception as e:
+        logging.error(f"Error updating contact status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update contacts")
+
+@api_router.post("/contacts/bulk/archive")
+async def bulk_archive_contacts(request: ContactBulkRequest, user: dict = Depends(verify_token)):
+    """Archive many contacts in one update_many (authenticated endpoint)"""
+    query = bulk_contact_selector(request)
+    try:
+        result = await db.contacts.update_many(query, status_update("archived", stamp_field="archived_at"))
+        return {"matched": result.matched_count, "modified": result.modified_count}
+    except Exception as e:
+        logging.error(f"Error archiving contacts: {e}")
+        raise HTTPException(status_code=500, detail="Failed to archive contacts")
+
+@api_router.post("/contacts/bulk/delete")
+async def bulk_delete_contacts(request: ContactBulkRequest, user: dict = Depends(verify_token)):
+    """Delete many contacts in one delete_many (authenticated endpoint)"""
+    query = bulk_contact_selector(request)
+    try:
+        # Decrements the day buckets of the deleted rows alongside the delete
+        deleted = await analytics_counters.delete_many("contacts", query)
+        return {"matched": deleted, "deleted": deleted}
+    except Exception as e:
+        logging.error(f"Error deleting contacts: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete contacts")
+
+@api_router.get("/contacts/search")
+async def search_contacts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = 20,
+    offset: int = 0,
+    fields: Optional[str] = None,
+    user: dict = Depends(verify_token)
+):
+    """Search contact name, company and message, best matches first (authenticated endpoint)"""
+    try:
+        projection = projection_for(fields, CONTACT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        results, next_offset = await contact_search.search(q, limit, offset, projection)
+        return FastJSONResponse({"count": len(results), "next_offset": next_offset, "contacts": results})
+    except Exception as e:
+        logging.error(f"Error searching contacts: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search contacts")
+
 # Analytics endpoint
 @api_router.get("/analytics")
 async def get_analytics(user: dict = Depends(verify_token)):
     """Get portfolio analytics (authenticated endpoint)"""
     try:
-        # Count documents in collections
-        subscribers_count = await db.subscribers.count_documents({})
-        feedback_count = await db.feedback.count_documents({})
-        contacts_count = await db.contacts.count_documents({})
-        
-        # Calculate some basic stats
-        recent_feedback = await db.feedback.find(
-            {"timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}}
-        ).to_list(100)
-        
-        avg_rating = sum(f.get("rating", 0) for f in recent_feedback) / len(recent_feedback) if recent_feedback else 0
-        
-        return {
-            "subscribers": subscribers_count,
-            "feedback": feedback_count,
-            "contacts": contacts_count,
-            "avg_rating": round(avg_rating, 1),
-            "recent_activity": {
-                "feedback_30d": len(recent_feedback),
-                "contacts_30d": await db.contacts.count_documents({
-                    "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
-                })
-            }
-        }
+        # One _id lookup against the materialized counters
+        analytics = await analytics_counters.read()
+        if analytics is None:
+            # Counters not built yet: answer from source and build them once
+            if not analytics_counters.reconciling:
+                analytics_counters.reconcile_soon()
+            analytics = await compute_analytics(db)
+        return analytics
     except Exception as e:
         logging.error(f"Error fetching analytics: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch analytics")
 
+@api_router.get("/analytics/timeseries")
+async def get_analytics_timeseries(
+    metric: str = "contacts",
+    granularity: str = "day",
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    user: dict = Depends(verify_token)
+):
+    """Per-day/week/month series read from pre-aggregated day buckets (authenticated endpoint)
+
+    Defaults to the last 30 days. Days without activity are returned as zeros
+    (avg_rating as null).
+    """
+    if metric not in TIMESERIES_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of: {', '.join(TIMESERIES_METRICS)}")
+    if granularity not in TIMESERIES_GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(TIMESERIES_GRANULARITIES)}")
+    end = to_naive_utc(end) if end else datetime.utcnow()
+    start = to_naive_utc(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="from must be before to")
+    if end - start > timedelta(days=MAX_TIMESERIES_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_TIMESERIES_DAYS} days")
+    try:
+        points = await analytics_counters.timeseries(metric, granularity, start, end)
+        return {"metric": metric, "granularity": granularity, "from": start, "to": end, "points": points}
+    except Exception as e:
+        logging.error(f"Error fetching analytics timeseries: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch analytics timeseries")
+
+@api_router.get("/analytics/report")
+async def get_analytics_report(
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    user: dict = Depends(verify_token)
+):
+    """Rating distribution, NPS, recommendation rates and lead cross-tabs (authenticated endpoint)"""
+    try:
+        report = await build_report(db, date_range_filter(start, end))
+        return {"from": start, "to": end, **report}
+    except Exception as e:
+        logging.error(f"Error building analytics report: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build analytics report")
+
+@api_router.post("/analytics/reconcile")
+async def reconcile_analytics(user: dict = Depends(verify_token)):
+    """Rebuild the analytics counters from source collections (authenticated endpoint)"""
+    try:
+        return await analytics_counters.reconcile()
+    except Exception as e:
+        logging.error(f"Error reconciling analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reconcile analytics")
+
 # AI Assist Request Model
 class AIAssistRequest(BaseModel):
     prompt: str
@@ -372,15 +1180,12 @@ class AIAssistRequest(BaseModel):
 @api_router.post("/ai-assist")
 async def ai_assist(
     request: AIAssistRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    user: dict = Depends(verify_token)
 ):
     """
     AI design assistance using Emergent LLM integration
     """
     try:
-        # Verify JWT token
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        
         # Try to use emergentintegrations for AI processing
         try:
             from emergentintegrations import EmergentIntegrations
@@ -423,8 +1228,6 @@ Respond with concise, implementable advice."""
                 "timestamp": datetime.utcnow()
             }
             
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         logging.error(f"Error in AI assist: {e}")
         # Return helpful fallback response
@@ -437,12 +1240,36 @@ Respond with concise, implementable advice."""
 # Include the router in the main app
 app.include_router(api_router)
 
+# Token-bucket limits for the public write endpoints: one bucket per client IP
+# and one per route. Override with RATE_LIMITS='{"POST /api/subscribe": {"ip": "5/minute"}}'
+RATE_LIMIT_DEFAULTS = {
+    "POST /api/subscribe": {"ip": "10/minute", "route": "600/minute"},
+    "POST /api/feedback": {"ip": "10/minute", "route": "300/minute"},
+    "POST /api/contact": {"ip": "10/minute", "route": "300/minute"},
+}
+if os.environ.get('RATE_LIMIT_BACKEND', 'memory') == 'mongo':
+    # Shared buckets so limits hold across multiple workers
+    rate_limit_backend = MongoRateLimitBackend(db.rate_limits)
+else:
+    rate_limit_backend = InMemoryRateLimitBackend()
+
+# Added before CORS so 429 responses still carry CORS headers
+app.add_middleware(
+    RateLimitMiddleware,
+    rules=load_rules(RATE_LIMIT_DEFAULTS, os.environ.get('RATE_LIMITS')),
+    backend=rate_limit_backend,
+    # The deployment sits behind one ingress; 0 keys buckets on the socket peer
+    trusted_proxy_hops=int(os.environ.get('RATE_LIMIT_PROXY_HOPS', '1')),
+    enabled=os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
 # Configure logging
@@ -501,58 +1328,32 @@ try:
     
     # Gemini AI endpoints
     @api_router.post("/ai/design-suggestions")
-    async def get_design_suggestions(request: AIDesignRequest, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def get_design_suggestions(request: AIDesignRequest, user: dict = Depends(verify_token)):
         """Generate AI-powered design suggestions for an element"""
-        try:
-            # Verify token
-            payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        except jwt.PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
         result = await gemini_service.generate_design_suggestions(request.element_info)
         return result
     
     @api_router.post("/ai/generate-css")
-    async def generate_css(request: AICSSRequest, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def generate_css(request: AICSSRequest, user: dict = Depends(verify_token)):
         """Generate CSS from description using AI"""
-        try:
-            payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        except jwt.PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
         result = await gemini_service.generate_css_from_description(request.description, request.element_type)
         return result
     
     @api_router.post("/ai/improve-content")
-    async def improve_content(request: AIContentRequest, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def improve_content(request: AIContentRequest, user: dict = Depends(verify_token)):
         """Improve content using AI"""
-        try:
-            payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        except jwt.PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
         result = await gemini_service.improve_content(request.content, request.content_type)
         return result
     
     @api_router.post("/ai/color-palette")
-    async def generate_color_palette(request: AIColorPaletteRequest, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def generate_color_palette(request: AIColorPaletteRequest, user: dict = Depends(verify_token)):
         """Generate AI color palette"""
-        try:
-            payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        except jwt.PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
         result = await gemini_service.generate_color_palette(request.theme)
         return result
     
     @api_router.post("/ai/analyze-element")
-    async def analyze_element(request: AIAnalysisRequest, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    async def analyze_element(request: AIAnalysisRequest, user: dict = Depends(verify_token)):
         """Analyze element for improvements using AI"""
-        try:
-            payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        except jwt.PyJWTError:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
         result = await gemini_service.analyze_element_for_improvements(request.element_html, request.context)
         return result
 
@@ -561,6 +1362,84 @@ try:
 except ImportError as e:
     logger.warning(f"Gemini AI service not available: {e}")
 
-@app.on_event("shutdown")
+async def merge_legacy_subscribers():
+    # Must precede the unique email index: rows stored before emails were
+    # normalized would otherwise let Foo@x.com and foo@x.com coexist
+    stats = await merge_legacy_emails(db.subscribers, db.job_state)
+    if stats["merged"]:
+        analytics_counters.reconcile_soon()
+
+async def ensure_indexes():
+    # Every index is declared in indexes.py; failures (e.g. legacy duplicate
+    # subscriber emails) are logged there and the rest are still applied
+    # The heartbeat TTL waits for the rollup backfill (enable_status_retention)
+    await apply_indexes(db, registry_from_env(status_retention=False))
+
+async def enable_status_retention(result: Dict[str, Any]) -> None:
+    """Apply the raw heartbeat TTL once rollups cover everything it would expire"""
+    if getattr(app.state, "status_retention_enabled", False):
+        return
+    cutoff = datetime.utcnow() - timedelta(days=STATUS_RETENTION_DAYS)
+    # until is None when there are no raw rows at all
+    if result["until"] is None or result["until"] >= cutoff:
+        results = await apply_indexes(db, status_retention_registry(STATUS_RETENTION_DAYS))
+        # A failure is logged by apply_indexes and retried after the next run
+        app.state.status_retention_enabled = all(r["action"] != "failed" for r in results)
+
+async def start_status_rollups():
+    app.state.status_retention_enabled = False
+    app.state.status_rollup_task = asyncio.create_task(
+        status_rollup_job.run_forever(STATUS_ROLLUP_INTERVAL, after_run=enable_status_retention)
+    )
+
+async def start_write_behind_queues():
+    if WRITE_BEHIND_JOURNAL_DIR:
+        Path(WRITE_BEHIND_JOURNAL_DIR).mkdir(parents=True, exist_ok=True)
+    for queue in (feedback_queue, contact_queue):
+        if queue is not None:
+            await queue.start()
+
+async def warm_subscriber_filter():
+    # Plain inserts are only safe while the unique index backs them up
+    indexes = await db.subscribers.index_information()
+    if not any(i.get("unique") and i["key"] == [("email", 1)] for i in indexes.values()):
+        subscriber_filter.enabled = False
+        return
+    if subscriber_filter.enabled:
+        app.state.subscriber_filter_task = asyncio.create_task(subscriber_filter.warm(db.subscribers))
+
+async def start_analytics_reconciliation():
+    app.state.analytics_reconcile_task = asyncio.create_task(
+        analytics_counters.run_forever(ANALYTICS_RECONCILE_INTERVAL, ANALYTICS_ROLLUP_INTERVAL)
+    )
+
+async def stop_background_tasks():
+    for name in ("status_rollup_task", "analytics_reconcile_task", "subscriber_filter_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+
+async def drain_write_behind_queues():
+    # Runs before shutdown_db_client so the final flush still has a client
+    for queue in (feedback_queue, contact_queue):
+        if queue is not None:
+            await queue.stop()
+
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+# Run in order by lifespan(); indexes come first so the warmup and background
+# jobs start against an indexed database
+STARTUP_HOOKS = (
+    merge_legacy_subscribers,
+    ensure_indexes,
+    start_status_rollups,
+    start_write_behind_queues,
+    warm_subscriber_filter,
+    start_analytics_reconciliation,
+)
+SHUTDOWN_HOOKS = (
+    stop_background_tasks,
+    drain_write_behind_queues,
+    shutdown_db_client,
+)
@@ -0,0 +1,120 @@
+"""
+Pre-serialized, pre-compressed response snapshots
+Hot public responses are encoded once and their gzip/brotli variants are
+compressed once when the snapshot is built, then served straight from memory
+according to the request's Accept-Encoding.
+"""
+import asyncio
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Below this size compression saves less than the headers it adds
+MIN_COMPRESS_SIZE = 500
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etags) -> bool:
+    """Evaluate an If-None-Match header against the given ETags"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # Weak comparison is what RFC 9110 prescribes for If-None-Match
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in etags:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Pick br, gzip or identity from an Accept-Encoding header"""
+    if not accept_encoding:
+        return "identity"
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = "identity", 0.0
+    for coding in supported:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        # Strictly greater keeps br ahead of gzip on ties
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class ResponseSnapshot:
+    """Encoded JSON body with its compressed variants built up front
+
+    Compression (brotli quality 11 takes tens of milliseconds on the content
+    document) happens in the constructor, so use create() from async code to
+    keep it off the event loop.
+    """
+    __slots__ = ("body", "etag", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = compute_etag(body)
+        self._variants: Dict[str, bytes] = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self._variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self._variants["br"] = brotli.compress(body, quality=11)
+
+    @classmethod
+    async def create(cls, body: bytes) -> "ResponseSnapshot":
+        return await asyncio.to_thread(cls, body)
+
+    def variant(self, encoding: str) -> bytes:
+        try:
+            return self._variants[encoding]
+        except KeyError:
+            raise ValueError(f"Unsupported encoding: {encoding}") from None
+
+    def variant_etag(self, encoding: str) -> str:
+        # Each content-coding is a distinct representation and needs its own
+        # strong validator
+        if encoding == "identity":
+            return self.etag
+        return self.etag[:-1] + "-" + encoding + '"'
+
+    def to_response(self, request: Request, cache_control: str = "no-cache") -> Response:
+        encoding = "identity"
+        if len(self.body) >= MIN_COMPRESS_SIZE:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+        headers = {
+            "ETag": self.variant_etag(encoding),
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding"
+        }
+        etags = {self.etag, self.variant_etag("gzip"), self.variant_etag("br")}
+        if etag_matches(request.headers.get("if-none-match"), etags):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.variant(encoding), media_type="application/json", headers=headers)
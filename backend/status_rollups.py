@@ -0,0 +1,181 @@
+"""
+Time-bucketed rollups and retention for status_checks
+A background job folds raw heartbeats into per-client minute and hour buckets
+so dashboards read a few hundred bucket documents instead of scanning raw
+rows, and a TTL index expires raw rows after a configurable window.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+EPOCH = datetime(1970, 1, 1)
+
+
+def floor_time(moment: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+OLDEST_RAW_FIRST = [("timestamp", 1)]
+SUMMARY_SORT = [("bucket_start", 1), ("client_name", 1)]
+
+
+def window_pipeline(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Raw heartbeats in [start, end) grouped into per-client minute buckets"""
+    return [
+        {"$match": {"timestamp": {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {
+                "client_name": "$client_name",
+                # date - date yields milliseconds, date - number yields a date
+                "bucket_start": {"$subtract": [
+                    "$timestamp", {"$mod": [{"$subtract": ["$timestamp", EPOCH]}, 60000]}
+                ]}
+            },
+            "count": {"$sum": 1},
+            "first_seen": {"$min": "$timestamp"},
+            "last_seen": {"$max": "$timestamp"}
+        }}
+    ]
+
+
+def hour_pipeline(hour: datetime) -> List[Dict[str, Any]]:
+    """One hour's minute buckets folded per client"""
+    return [
+        {"$match": {"granularity": "minute", "bucket_start": {"$gte": hour, "$lt": hour + GRANULARITIES["hour"]}}},
+        {"$group": {
+            "_id": "$client_name",
+            "count": {"$sum": "$count"},
+            "first_seen": {"$min": "$first_seen"},
+            "last_seen": {"$max": "$last_seen"}
+        }}
+    ]
+
+
+def summary_query(
+    granularity: str, start: datetime, end: datetime, client_name: Optional[str] = None
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"granularity": granularity, "bucket_start": {"$gte": start, "$lt": end}}
+    if client_name:
+        query["client_name"] = client_name
+    return query
+
+
+class StatusRollupJob:
+    def __init__(
+        self,
+        raw,
+        rollups,
+        state,
+        lag_seconds: int = 60,
+        max_window: timedelta = timedelta(days=1),
+        minute_retention_days: int = 90
+    ):
+        self.raw = raw
+        self.rollups = rollups
+        self.state = state
+        # Heartbeats are timestamped before insert_many writes them, so the
+        # newest minutes are left alone until late writes have landed
+        self.lag = timedelta(seconds=lag_seconds)
+        self.max_window = max_window
+        self.minute_retention = timedelta(days=minute_retention_days)
+
+    async def _watermark(self) -> Optional[datetime]:
+        state = await self.state.find_one({"_id": "status_rollup"})
+        if state:
+            return state["until"]
+        oldest = await self.raw.find_one({}, {"timestamp": 1}, sort=OLDEST_RAW_FIRST)
+        return floor_time(oldest["timestamp"], "minute") if oldest else None
+
+    async def _roll_window(self, start: datetime, end: datetime) -> int:
+        """Recompute every minute bucket in [start, end) and the hours they touch"""
+        groups = await self.raw.aggregate(window_pipeline(start, end)).to_list(None)
+
+        # Windows are minute-aligned, so each minute bucket is fully covered by
+        # one run and $set keeps reruns idempotent
+        operations = [
+            UpdateOne(
+                {"granularity": "minute", "client_name": g["_id"]["client_name"], "bucket_start": g["_id"]["bucket_start"]},
+                {"$set": {
+                    "count": g["count"],
+                    "first_seen": g["first_seen"],
+                    "last_seen": g["last_seen"],
+                    "expires_at": g["_id"]["bucket_start"] + self.minute_retention
+                }},
+                upsert=True
+            )
+            for g in groups
+        ]
+        if operations:
+            await self.rollups.bulk_write(operations, ordered=False)
+
+        hours = {floor_time(g["_id"]["bucket_start"], "hour") for g in groups}
+        for hour in hours:
+            await self._roll_hour(hour)
+        return len(groups)
+
+    async def _roll_hour(self, hour: datetime) -> None:
+        """Rebuild one hour's buckets from its minute buckets"""
+        operations = [
+            UpdateOne(
+                {"granularity": "hour", "client_name": g["_id"], "bucket_start": hour},
+                {"$set": {"count": g["count"], "first_seen": g["first_seen"], "last_seen": g["last_seen"]}},
+                upsert=True
+            )
+            for g in await self.rollups.aggregate(hour_pipeline(hour)).to_list(None)
+        ]
+        if operations:
+            await self.rollups.bulk_write(operations, ordered=False)
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Roll up everything between the watermark and now minus the lag"""
+        end = floor_time((now or datetime.utcnow()) - self.lag, "minute")
+        start = await self._watermark()
+        buckets = 0
+        windows = 0
+        while start is not None and start < end:
+            window_end = min(end, start + self.max_window)
+            buckets += await self._roll_window(start, window_end)
+            await self.state.update_one(
+                {"_id": "status_rollup"}, {"$set": {"until": window_end}}, upsert=True
+            )
+            start = window_end
+            windows += 1
+        return {"windows": windows, "minute_buckets": buckets, "until": start}
+
+    async def run_forever(
+        self,
+        interval_seconds: float,
+        after_run: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> None:
+        """Roll up every interval; after_run receives each successful run's result"""
+        while True:
+            try:
+                result = await self.run_once()
+                if after_run is not None:
+                    await after_run(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Status rollup failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    async def summary(
+        self,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        client_name: Optional[str] = None,
+        limit: int = 2000
+    ) -> List[Dict[str, Any]]:
+        cursor = self.rollups.find(
+            summary_query(granularity, start, end, client_name), {"_id": 0, "granularity": 0, "expires_at": 0}
+        ).sort(SUMMARY_SORT).limit(limit)
+        return await cursor.to_list(limit)
@@ -0,0 +1,60 @@
+"""
+Canonical subscriber emails
+Emails are stored trimmed and lowercased so the unique index on
+subscribers.email means one row per address. merge_legacy_emails() is the
+one-time migration for rows written before that: it rewrites them to the
+canonical form and folds case variants into the earliest subscription, and
+must run before the unique index is built.
+"""
+import logging
+from typing import Any, Dict, List
+
+from pymongo import DeleteMany, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ID = "subscriber_emails_normalized"
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form stored in subscribers.email (unique index)"""
+    return email.strip().lower()
+
+
+async def merge_legacy_emails(collection, state) -> Dict[str, int]:
+    """Normalize stored emails once, keeping the earliest row per address
+
+    state is the job_state collection; a marker document there makes every
+    later startup a single _id lookup.
+    """
+    if await state.find_one({"_id": MIGRATION_ID}, {"_id": 1}):
+        return {"normalized": 0, "merged": 0}
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    async for doc in collection.find({}, {"email": 1, "subscribed_at": 1}):
+        if isinstance(doc.get("email"), str):
+            groups.setdefault(normalize_email(doc["email"]), []).append(doc)
+
+    deletes = []
+    updates = []
+    merged = 0
+    for email, docs in groups.items():
+        if len(docs) == 1 and docs[0]["email"] == email:
+            continue
+        # The first subscription wins; rows without a date sort last
+        docs.sort(key=lambda d: (d.get("subscribed_at") is None, d.get("subscribed_at") or 0))
+        keeper, duplicates = docs[0], docs[1:]
+        if duplicates:
+            merged += len(duplicates)
+            deletes.append(DeleteMany({"_id": {"$in": [d["_id"] for d in duplicates]}}))
+        if keeper["email"] != email:
+            updates.append(UpdateOne({"_id": keeper["_id"]}, {"$set": {"email": email}}))
+
+    # Duplicates go first so the rewritten email never collides with one
+    operations = deletes + updates
+    for start in range(0, len(operations), 1000):
+        await collection.bulk_write(operations[start:start + 1000], ordered=True)
+    await state.update_one({"_id": MIGRATION_ID}, {"$set": {"merged": merged, "normalized": len(updates)}}, upsert=True)
+    if operations:
+        logger.info(f"Normalized {len(updates)} subscriber emails and merged {merged} case-variant duplicates")
+    return {"normalized": len(updates), "merged": merged}
@@ -0,0 +1,196 @@
+"""
+Write-behind ingestion for public form submissions
+Validated documents are acknowledged immediately and flushed to MongoDB in
+unordered insert_many batches, either when a batch fills up or when the flush
+interval elapses. The queue is bounded, drained on shutdown, and can append
+each accepted document to an on-disk journal that is replayed at startup so
+acknowledged submissions survive a crash. Documents the server rejects (e.g. a
+validation failure) are moved to a dead-letter collection instead of being
+retried, so one bad row never blocks the rows queued behind it.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+DEAD_LETTER_COLLECTION = "write_behind_dead_letters"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot journal {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if set(obj) == {"$date"}:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        collection,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        journal_path: Optional[str] = None,
+        dead_letters=None
+    ):
+        self.collection = collection
+        self.dead_letters = dead_letters if dead_letters is not None else collection.database[DEAD_LETTER_COLLECTION]
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal_path = journal_path
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._journal = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def offer(self, document: Dict[str, Any]) -> bool:
+        """Queue a document for writing; False when full so the caller writes inline"""
+        if len(self._pending) >= self.max_size:
+            return False
+        if self._journal is not None:
+            # Flushed to the OS before acknowledging, so a process crash keeps it
+            self._journal.write(json.dumps(document, default=_encode) + "\n")
+            self._journal.flush()
+        self._pending.append(document)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        if self.journal_path:
+            journal = open(self.journal_path, "a+", encoding="utf-8")
+            try:
+                # Held until stop(); two processes appending to and truncating
+                # one journal would lose each other's rows
+                fcntl.flock(journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                journal.close()
+                raise RuntimeError(
+                    f"Write-behind journal {self.journal_path} is locked by another process; "
+                    "give each worker its own WRITE_BEHIND_JOURNAL_DIR"
+                ) from None
+            self._journal = journal
+            await self._replay_journal()
+        # Created here so it binds to the serving event loop
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out everything still queued"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            if not await self.flush():
+                logger.error(f"{len(self._pending)} queued {self.collection.name} documents left in the journal")
+                break
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending:
+                if not await self.flush() or len(self._pending) < self.batch_size:
+                    break
+
+    async def flush(self) -> bool:
+        """Write one batch; if the write fails outright the batch stays queued
+
+        Per-document errors from the unordered insert are final: duplicates
+        were already written by an earlier attempt, and anything else is
+        dead-lettered. Either way the batch leaves the queue.
+        """
+        batch: List[Dict[str, Any]] = [self._pending[i] for i in range(min(self.batch_size, len(self._pending)))]
+        if not batch:
+            return True
+        try:
+            # insert_many sets _id on the dicts, so retries of the same batch
+            # resolve to duplicate-key errors instead of double inserts
+            await self.collection.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            if not await self._dead_letter(batch, e.details.get("writeErrors", [])):
+                return False
+        except Exception as e:
+            logger.error(f"Write-behind flush to {self.collection.name} failed: {e}")
+            return False
+        for _ in batch:
+            self._pending.popleft()
+        # No await between the check and the truncate, so nothing can be
+        # journaled in between; under sustained load truncation waits for a lull
+        if not self._pending and self._journal is not None:
+            self._journal.truncate(0)
+        return True
+
+    async def _dead_letter(self, batch: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> bool:
+        """Move rejected documents aside; False if that write fails too"""
+        now = datetime.utcnow()
+        rejected = [
+            {"collection": self.collection.name, "document": batch[err["index"]],
+             "code": err.get("code"), "error": err.get("errmsg"), "failed_at": now}
+            for err in errors if err.get("code") != DUPLICATE_KEY
+        ]
+        if not rejected:
+            return True
+        try:
+            await self.dead_letters.insert_many(rejected, ordered=False)
+        except Exception as e:
+            logger.error(f"Write-behind dead-lettering for {self.collection.name} failed: {e}")
+            return False
+        for row in rejected:
+            logger.error(
+                f"Dead-lettered {self.collection.name} document {row['document'].get('id')}: {row['error']}"
+            )
+        return True
+
+    async def _replay_journal(self) -> None:
+        self._journal.seek(0)
+        documents = []
+        for line in self._journal:
+            try:
+                documents.append(json.loads(line, object_hook=_decode))
+            except ValueError:
+                # A torn last line from the crash was never acknowledged
+                continue
+        if documents:
+            # Some of these may have been flushed before the crash; upserting on
+            # the public id keeps the replay idempotent
+            for start in range(0, len(documents), self.batch_size):
+                batch = documents[start:start + self.batch_size]
+                try:
+                    await self.collection.bulk_write([
+                        UpdateOne({"id": doc["id"]}, {"$setOnInsert": doc}, upsert=True)
+                        for doc in batch
+                    ], ordered=False)
+                except BulkWriteError as e:
+                    if not await self._dead_letter(batch, e.details.get("writeErrors", [])):
+                        raise
+            logger.info(f"Replayed {len(documents)} journaled {self.collection.name} documents")
+        self._journal.truncate(0)
@@ -80,6 +80,11 @@ async function handleFetch(request, url, isExternal) {
   const cacheKey = request.url;
   
   try {
+    // Portfolio content: revalidate the cached copy through the delta-sync endpoint
+    if (url.pathname === '/api/content') {
+      return await contentDeltaStrategy(request, cacheKey);
+    }
+    
     // For API requests, try network first with cache fallback
     if (url.pathname.startsWith('/api/') || url.hostname === 'api.github.com') {
       return await networkFirstStrategy(request, cacheKey);
@@ -141,6 +146,59 @@ async function networkFirstStrategy(request, cacheKey) {
   }
 }
 
+// Merge only the sections changed since the cached revision into the cached content
+async function contentDeltaStrategy(request, cacheKey) {
+  const cache = await caches.open(RUNTIME_CACHE);
+  const cachedResponse = await cache.match(cacheKey);
+  
+  if (!cachedResponse) {
+    return await networkFirstStrategy(request, cacheKey);
+  }
+  
+  try {
+    const content = await cachedResponse.clone().json();
+    if (typeof content.revision !== 'number') {
+      return await networkFirstStrategy(request, cacheKey);
+    }
+    
+    const changesUrl = new URL('/api/content/changes', request.url);
+    changesUrl.searchParams.set('since', content.revision);
+    const changesResponse = await fetch(changesUrl.toString());
+    
+    if (!changesResponse.ok) {
+      throw new Error(`Delta sync not ok: ${changesResponse.status}`);
+    }
+    
+    const delta = await changesResponse.json();
+    if (delta.reset) {
+      return await networkFirstStrategy(request, cacheKey);
+    }
+    if (delta.revision === content.revision) {
+      return cachedResponse;
+    }
+    
+    const merged = {
+      ...content,
+      ...delta.changed,
+      revision: delta.revision,
+      updated_at: delta.updated_at
+    };
+    const mergedResponse = new Response(JSON.stringify(merged), {
+      headers: {
+        'Content-Type': 'application/json',
+        'Date': new Date().toUTCString()
+      }
+    });
+    
+    cache.put(cacheKey, mergedResponse.clone());
+    return mergedResponse;
+    
+  } catch (error) {
+    console.log('[SW] Content delta sync failed, refetching:', error.message);
+    return await networkFirstStrategy(request, cacheKey);
+  }
+}
+
 async function cacheFirstStrategy(request, cacheKey) {
   // Try cache first
   const cache = await caches.open(CACHE_NAME);
@@ -0,0 +1,219 @@
+"""
+Query plan checks for the index registry
+Applies backend/indexes.py to a scratch database, runs every query shape the
+app issues through explain() and fails if any winning plan scans a whole
+collection. Needs a MongoDB server (MONGO_URL, default
+mongodb://localhost:27017); skipped when none is reachable.
+
+Deliberate full scans are not listed: count_documents({}) on the analytics
+fallback, the full analytics reconcile, the subscriber Bloom filter warm-up,
+the in-process search index build and unfiltered exports/reports.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from analytics import (  # noqa: E402
+    DAY_ORDER, day_buckets_query, reconcile_pipeline, recent_query, recent_rating_pipeline
+)
+from content_revisions import (  # noqa: E402
+    NEWEST_FIRST, OLDEST_FIRST, delta_query, history_query, revision_query, snapshot_query
+)
+from indexes import apply_indexes, index_registry  # noqa: E402
+from pagination import encode_cursor, page_query  # noqa: E402
+from queries import (  # noqa: E402
+    CURRENT_CONTENT, FEEDBACK_SORTS, TIMESTAMP_SORT, contact_query, contact_selector, date_range_filter,
+    feedback_query, keyset_sort
+)
+from search import hydrate_query, text_query  # noqa: E402
+from status_rollups import (  # noqa: E402
+    OLDEST_RAW_FIRST, SUMMARY_SORT, hour_pipeline, summary_query, window_pipeline
+)
+from subscriber_emails import normalize_email  # noqa: E402
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = f"query_plan_test_{uuid.uuid4().hex[:8]}"
+
+NOW = datetime(2026, 1, 15, 12, 0)
+SINCE = NOW - timedelta(days=30)
+DESC = keyset_sort(TIMESTAMP_SORT, "desc")
+RATING_DESC = keyset_sort(FEEDBACK_SORTS["rating"], "desc")
+
+
+def page(query, sort, after=None):
+    """The find fetch_page issues for a default page, optionally past a cursor"""
+    cursor = encode_cursor(after) if after else None
+    return {"filter": page_query(query, sort, cursor), "sort": sort, "limit": 101}
+
+
+def find(query, sort=None, limit=None):
+    return {"filter": query, "sort": sort, "limit": limit}
+
+
+def count(query):
+    """count_documents() runs as a $match + $group aggregate"""
+    return {"pipeline": [{"$match": query}, {"$group": {"_id": None, "n": {"$sum": 1}}}]}
+
+
+# name -> (collection, find spec or aggregate pipeline); every filter, sort
+# and pipeline comes from the helper the endpoint or job calls
+QUERIES = {
+    "content current": ("portfolio_content", find(CURRENT_CONTENT)),
+    "revisions list": ("content_revisions", find(history_query(), NEWEST_FIRST, 50)),
+    "revisions list before": ("content_revisions", find(history_query(40), NEWEST_FIRST, 50)),
+    "revision exists": ("content_revisions", find(revision_query(12))),
+    "nearest snapshot": ("content_revisions", find(snapshot_query(12), NEWEST_FIRST, 1)),
+    "delta replay": ("content_revisions", find(delta_query(0, 12), OLDEST_FIRST)),
+
+    "subscribe upsert": ("subscribers", find({"email": normalize_email(" A@Example.com ")})),
+    "subscribers reconcile since": ("subscribers", {"pipeline": reconcile_pipeline("subscribers", SINCE)}),
+
+    "status page": ("status_checks", page({}, DESC)),
+    "status page after": ("status_checks", page({}, DESC, [NOW, "id-5"])),
+    "rollup watermark": ("status_checks", find({}, OLDEST_RAW_FIRST, 1)),
+    "rollup window": ("status_checks", {"pipeline": window_pipeline(SINCE, NOW)}),
+    "rollup hour": ("status_rollups", {"pipeline": hour_pipeline(SINCE)}),
+    "rollup summary": ("status_rollups", find(summary_query("hour", SINCE, NOW), SUMMARY_SORT, 2000)),
+    "rollup summary client": ("status_rollups", find(summary_query("hour", SINCE, NOW, "web"), SUMMARY_SORT, 2000)),
+
+    "feedback page": ("feedback", page(feedback_query(), DESC)),
+    "feedback page after": ("feedback", page(feedback_query(), DESC, [NOW, "id-5"])),
+    "feedback by category": ("feedback", page(feedback_query(category="general"), DESC)),
+    "feedback by rating": ("feedback", page(feedback_query(min_rating=4), DESC)),
+    "feedback category and rating": ("feedback", page(feedback_query("general", min_rating=4), DESC)),
+    "feedback date range": ("feedback", page(feedback_query(start=SINCE, end=NOW), DESC)),
+    "feedback sorted by rating": ("feedback", page(feedback_query(), RATING_DESC)),
+    "feedback category sorted by rating": ("feedback", page(feedback_query("general"), RATING_DESC, [5, NOW, "id-5"])),
+    "feedback recent ratings": ("feedback", {"pipeline": recent_rating_pipeline(SINCE)}),
+    "feedback reconcile since": ("feedback", {"pipeline": reconcile_pipeline("feedback", SINCE)}),
+    "feedback search": ("feedback", find(text_query("great work"))),
+    "feedback search hydrate": ("feedback", find(hydrate_query(["id-1", "id-2"]))),
+    "feedback report range": ("feedback", find(date_range_filter(SINCE, NOW))),
+
+    "contacts page": ("contacts", page(contact_query(), DESC)),
+    "contacts new": ("contacts", page(contact_query(status="new"), DESC)),
+    "contacts by status": ("contacts", page(contact_query(status="replied"), DESC, [NOW, "id-5"])),
+    "contacts by urgency": ("contacts", page(contact_query(urgency="urgent"), DESC)),
+    "contacts status and urgency": ("contacts", page(contact_query("replied", "urgent"), DESC)),
+    "contacts date range": ("contacts", page(contact_query(start=SINCE, end=NOW), DESC)),
+    "contacts 30 day count": ("contacts", count(recent_query(SINCE))),
+    "contacts reconcile since": ("contacts", {"pipeline": reconcile_pipeline("contacts", SINCE)}),
+    "contacts bulk by ids": ("contacts", find(contact_selector(ids=["id-1", "id-2"]))),
+    "contacts bulk by filter": ("contacts", find(contact_selector(contact_query("new", end=NOW)))),
+    "contacts search": ("contacts", find(text_query("mvp budget"))),
+
+    "counters reconcile days": ("analytics_counters", find(day_buckets_query(SINCE))),
+    "counters timeseries": ("analytics_counters", find(day_buckets_query(SINCE, NOW), DAY_ORDER)),
+}
+
+
+async def seed(db) -> None:
+    # A few rows per collection so the planner has real candidates to choose from
+    rows = range(20)
+    stamp = lambda i: NOW - timedelta(days=i)  # noqa: E731
+    await db.portfolio_content.insert_one(dict(CURRENT_CONTENT))
+    await db.content_revisions.insert_many(
+        [{"revision": i, "kind": "snapshot" if i % 5 == 1 else "delta"} for i in rows]
+    )
+    await db.subscribers.insert_many([{"email": f"s{i}@example.com", "subscribed_at": stamp(i)} for i in rows])
+    await db.status_checks.insert_many([{"id": f"id-{i}", "client_name": "web", "timestamp": stamp(i)} for i in rows])
+    await db.status_rollups.insert_many(
+        [{"granularity": "hour", "client_name": "web", "bucket_start": stamp(i)} for i in rows]
+    )
+    await db.feedback.insert_many([
+        {"id": f"id-{i}", "category": "general", "rating": i % 5 + 1, "message": "great work",
+         "name": "n", "timestamp": stamp(i)}
+        for i in rows
+    ])
+    await db.contacts.insert_many([
+        {"id": f"id-{i}", "status": "new", "urgency": "normal", "message": "mvp budget",
+         "name": "n", "timestamp": stamp(i)}
+        for i in rows
+    ])
+    await db.analytics_counters.insert_many([{"_id": f"day:{i}", "kind": "day", "date": stamp(i)} for i in rows])
+
+
+async def explain(db, collection: str, spec):
+    if "pipeline" in spec:
+        return await db.command("aggregate", collection, pipeline=spec["pipeline"], explain=True)
+    cursor = db[collection].find(spec["filter"])
+    if spec.get("sort"):
+        cursor = cursor.sort(spec["sort"])
+    if spec.get("limit"):
+        cursor = cursor.limit(spec["limit"])
+    return await cursor.explain()
+
+
+async def collect_plans():
+    client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        await client.admin.command("ping")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"MongoDB not reachable at {MONGO_URL}: {e}")
+    db = client[DB_NAME]
+    try:
+        results = await apply_indexes(db, index_registry(rate_limits=True))
+        failed = [r for r in results if r["action"] not in ("created", "unchanged")]
+        assert not failed, f"registry did not apply cleanly: {failed}"
+        await seed(db)
+        return {name: await explain(db, collection, spec) for name, (collection, spec) in QUERIES.items()}
+    finally:
+        await client.drop_database(DB_NAME)
+        client.close()
+
+
+def collscans(plan):
+    """COLLSCAN stages anywhere in the chosen plan (rejected plans are ignored)"""
+    if isinstance(plan, dict):
+        found = [plan] if plan.get("stage") == "COLLSCAN" else []
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                found.extend(collscans(value))
+        return found
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in collscans(item)]
+    return []
+
+
+@pytest.fixture(scope="module")
+def plans():
+    return asyncio.run(collect_plans())
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_query_uses_an_index(plans, name):
+    collection, spec = QUERIES[name]
+    assert not collscans(plans[name]), f"{name} scans all of {collection}: {spec}"
+
+
+def test_registry_is_idempotent():
+    async def run():
+        client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=2000)
+        try:
+            await client.admin.command("ping")
+        except PyMongoError as e:
+            client.close()
+            pytest.skip(f"MongoDB not reachable at {MONGO_URL}: {e}")
+        db = client[f"{DB_NAME}_idempotent"]
+        try:
+            registry = index_registry(rate_limits=True)
+            await apply_indexes(db, registry)
+            second = await apply_indexes(db, registry)
+            assert {r["action"] for r in second} == {"unchanged"}
+            # A new retention window is applied in place rather than rebuilt
+            retuned = await apply_indexes(db, index_registry(status_retention_days=7, rate_limits=True))
+            assert [r["index"] for r in retuned if r["action"] == "updated"] == ["timestamp_1"]
+        finally:
+            await client.drop_database(f"{DB_NAME}_idempotent")
+            client.close()
+    asyncio.run(run())